@@ -8,6 +8,7 @@ from sqlalchemy import pool
 from alembic import context
 from src import db
 from src.bookmarks import tables
+from src.common import tables as common_tables
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 load_dotenv(os.path.join(BASE_DIR, ".env"))
@@ -0,0 +1,26 @@
+"""bookmark claims
+
+Revision ID: 077a3245477b
+Revises: 302db4cbce49
+Create Date: 2026-10-18 10:41:09.318774
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "077a3245477b"
+down_revision = "302db4cbce49"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("bookmarks", sa.Column("claimed_by", sa.String(64), nullable=True))
+    op.add_column("bookmarks", sa.Column("claimed_until", sa.DateTime, nullable=True))
+
+
+def downgrade():
+    op.drop_column("bookmarks", "claimed_until")
+    op.drop_column("bookmarks", "claimed_by")
@@ -0,0 +1,29 @@
+"""leases
+
+Revision ID: 302db4cbce49
+Revises: e3a48adccaf5
+Create Date: 2026-10-18 10:03:27.551902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "302db4cbce49"
+down_revision = "e3a48adccaf5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "leases",
+        sa.Column("name", sa.String(100), primary_key=True),
+        sa.Column("owner", sa.String(255), nullable=False),
+        sa.Column("expires_at", sa.DateTime, nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("leases")
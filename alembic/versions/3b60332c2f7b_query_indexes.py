@@ -0,0 +1,44 @@
+"""query indexes
+
+Revision ID: 3b60332c2f7b
+Revises: e325999dc16f
+Create Date: 2026-10-18 12:47:33.105528
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3b60332c2f7b"
+down_revision = "e325999dc16f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_bookmarks_active_fetch",
+        "bookmarks",
+        ["is_active", "last_fetch_at", "id"],
+    )
+    op.create_index(
+        "ix_bookmarks_source_fetch", "bookmarks", ["source", "last_fetch_at"]
+    )
+    op.create_index(
+        "ix_bookmarks_author_fetch", "bookmarks", ["author", "last_fetch_at"]
+    )
+    op.create_index(
+        "ix_bookmarks_read_fetch", "bookmarks", ["is_read", "last_fetch_at"]
+    )
+    op.create_index(
+        "ix_sessions_active_created", "sessions", ["is_active", "created_at"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_sessions_active_created", table_name="sessions")
+    op.drop_index("ix_bookmarks_read_fetch", table_name="bookmarks")
+    op.drop_index("ix_bookmarks_author_fetch", table_name="bookmarks")
+    op.drop_index("ix_bookmarks_source_fetch", table_name="bookmarks")
+    op.drop_index("ix_bookmarks_active_fetch", table_name="bookmarks")
@@ -7,18 +7,52 @@ Create Date: 2021-02-25 09:54:14.713700
 """
 from alembic import op
 import sqlalchemy as sa
+from fastapi_utils.guid_type import GUID
 
 
 # revision identifiers, used by Alembic.
-revision = '461eebcdc498'
+revision = "461eebcdc498"
 down_revision = None
 branch_labels = None
 depends_on = None
 
 
 def upgrade():
-    pass
+    op.create_table(
+        "users",
+        sa.Column("id", GUID, primary_key=True),
+        sa.Column("email", sa.String(255), unique=True),
+        sa.Column("hashed_password", sa.String(255)),
+        sa.Column("last_login_at", sa.DateTime, nullable=True),
+        sa.Column("is_active", sa.Boolean),
+        sa.Column("failed_attempts", sa.Integer),
+    )
+    op.create_table(
+        "sessions",
+        sa.Column("id", GUID, primary_key=True),
+        sa.Column("user_id", GUID, sa.ForeignKey("users.id")),
+        sa.Column("token", sa.String(255), unique=True, nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=True),
+        sa.Column("is_active", sa.Boolean),
+    )
+    op.create_table(
+        "bookmarks",
+        sa.Column("id", GUID, primary_key=True),
+        sa.Column("url", sa.String(1000)),
+        sa.Column("url_hash", sa.String(40), unique=True),
+        sa.Column("title", sa.String(255), nullable=True),
+        sa.Column("source", sa.String(50)),
+        sa.Column("author", sa.String(50), nullable=True),
+        sa.Column("description", sa.String(500), nullable=True),
+        sa.Column("image_url", sa.String(500), nullable=True),
+        sa.Column("last_fetch_at", sa.DateTime, nullable=True),
+        sa.Column("is_active", sa.Boolean),
+        sa.Column("failed_attempts", sa.Integer),
+        sa.Column("is_read", sa.Boolean),
+    )
 
 
 def downgrade():
-    pass
+    op.drop_table("bookmarks")
+    op.drop_table("sessions")
+    op.drop_table("users")
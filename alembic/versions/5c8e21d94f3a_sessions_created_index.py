@@ -0,0 +1,24 @@
+"""sessions created index
+
+Revision ID: 5c8e21d94f3a
+Revises: a41f0c9d2b7e
+Create Date: 2026-10-18 16:02:41.530716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5c8e21d94f3a"
+down_revision = "a41f0c9d2b7e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_sessions_created", "sessions", ["created_at"])
+
+
+def downgrade():
+    op.drop_index("ix_sessions_created", table_name="sessions")
@@ -0,0 +1,79 @@
+"""bookmark stats
+
+Revision ID: 7be25e9f58c7
+Revises: 077a3245477b
+Create Date: 2026-10-18 11:20:52.604138
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "7be25e9f58c7"
+down_revision = "077a3245477b"
+branch_labels = None
+depends_on = None
+
+# Spelled out rather than imported, so replaying this revision never changes
+# with later edits to src.bookmarks.tables
+_BUCKET_NEW = "COALESCE(NEW.source, ''), COALESCE(NEW.is_read, 0)"
+_BUCKET_OLD = "COALESCE(OLD.source, ''), COALESCE(OLD.is_read, 0)"
+_PENDING_NEW = "COALESCE(NEW.last_fetch_at IS NULL AND NEW.is_active = 1, 0)"
+_PENDING_OLD = "COALESCE(OLD.last_fetch_at IS NULL AND OLD.is_active = 1, 0)"
+_INACTIVE_NEW = "COALESCE(NEW.is_active = 0, 0)"
+_INACTIVE_OLD = "COALESCE(OLD.is_active = 0, 0)"
+
+_ADD_NEW = (
+    "INSERT INTO bookmark_stats (source, is_read, total, pending, inactive) "
+    f"VALUES ({_BUCKET_NEW}, 1, {_PENDING_NEW}, {_INACTIVE_NEW}) "
+    "ON DUPLICATE KEY UPDATE total = total + 1, "
+    "pending = pending + VALUES(pending), inactive = inactive + VALUES(inactive)"
+)
+_REMOVE_OLD = (
+    "UPDATE bookmark_stats SET total = total - 1, "
+    f"pending = pending - {_PENDING_OLD}, inactive = inactive - {_INACTIVE_OLD} "
+    f"WHERE (source, is_read) = ({_BUCKET_OLD})"
+)
+
+stats_triggers = [
+    "CREATE TRIGGER bookmark_stats_insert AFTER INSERT ON bookmarks "
+    f"FOR EACH ROW {_ADD_NEW}",
+    "CREATE TRIGGER bookmark_stats_delete AFTER DELETE ON bookmarks "
+    f"FOR EACH ROW {_REMOVE_OLD}",
+    "CREATE TRIGGER bookmark_stats_update AFTER UPDATE ON bookmarks "
+    "FOR EACH ROW BEGIN "
+    f"IF NOT (({_BUCKET_OLD}) <=> ({_BUCKET_NEW}) "
+    f"AND {_PENDING_OLD} = {_PENDING_NEW} "
+    f"AND {_INACTIVE_OLD} = {_INACTIVE_NEW}) THEN "
+    f"{_REMOVE_OLD}; {_ADD_NEW}; "
+    "END IF; END",
+]
+
+
+def upgrade():
+    op.create_table(
+        "bookmark_stats",
+        sa.Column("source", sa.String(50), primary_key=True),
+        sa.Column("is_read", sa.Boolean, primary_key=True),
+        sa.Column("total", sa.Integer, nullable=False, default=0),
+        sa.Column("pending", sa.Integer, nullable=False, default=0),
+        sa.Column("inactive", sa.Integer, nullable=False, default=0),
+    )
+    for trigger in stats_triggers:
+        op.execute(trigger)
+
+    op.execute(
+        "INSERT INTO bookmark_stats (source, is_read, total, pending, inactive) "
+        "SELECT COALESCE(source, ''), COALESCE(is_read, 0), COUNT(*), "
+        "SUM(CASE WHEN last_fetch_at IS NULL AND is_active = 1 THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN is_active = 0 THEN 1 ELSE 0 END) "
+        "FROM bookmarks GROUP BY COALESCE(source, ''), COALESCE(is_read, 0)"
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS bookmark_stats_update")
+    op.execute("DROP TRIGGER IF EXISTS bookmark_stats_delete")
+    op.execute("DROP TRIGGER IF EXISTS bookmark_stats_insert")
+    op.drop_table("bookmark_stats")
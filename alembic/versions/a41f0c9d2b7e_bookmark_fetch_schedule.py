@@ -0,0 +1,41 @@
+"""bookmark fetch schedule
+
+Revision ID: a41f0c9d2b7e
+Revises: 3b60332c2f7b
+Create Date: 2026-10-18 13:25:08.412356
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a41f0c9d2b7e"
+down_revision = "3b60332c2f7b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("bookmarks", sa.Column("content_hash", sa.String(40), nullable=True))
+    op.add_column(
+        "bookmarks",
+        sa.Column("unchanged_fetches", sa.Integer, nullable=True, default=0),
+    )
+    op.add_column("bookmarks", sa.Column("next_fetch_at", sa.DateTime, nullable=True))
+    # Keep the old fixed 20 day window (REFRESH_URLS_OLDER_THAN_DAYS default) for
+    # the first round; the schedule adapts from there
+    op.execute(
+        "UPDATE bookmarks SET unchanged_fetches = 0, next_fetch_at = IF("
+        "last_fetch_at IS NULL, UTC_TIMESTAMP(), last_fetch_at + INTERVAL 20 DAY)"
+    )
+    op.create_index(
+        "ix_bookmarks_active_next_fetch", "bookmarks", ["is_active", "next_fetch_at"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_bookmarks_active_next_fetch", table_name="bookmarks")
+    op.drop_column("bookmarks", "next_fetch_at")
+    op.drop_column("bookmarks", "unchanged_fetches")
+    op.drop_column("bookmarks", "content_hash")
@@ -0,0 +1,37 @@
+"""bookmark random key
+
+Revision ID: e325999dc16f
+Revises: 7be25e9f58c7
+Create Date: 2026-10-18 12:02:15.840921
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e325999dc16f"
+down_revision = "7be25e9f58c7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "bookmarks",
+        sa.Column("random_key", sa.Float(53), nullable=False, server_default="0"),
+    )
+    op.execute("UPDATE bookmarks SET random_key = RAND()")
+    op.alter_column(
+        "bookmarks",
+        "random_key",
+        server_default=None,
+        existing_type=sa.Float(53),
+        existing_nullable=False,
+    )
+    op.create_index("ix_bookmarks_random_key", "bookmarks", ["random_key"])
+
+
+def downgrade():
+    op.drop_index("ix_bookmarks_random_key", table_name="bookmarks")
+    op.drop_column("bookmarks", "random_key")
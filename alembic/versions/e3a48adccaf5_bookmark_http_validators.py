@@ -0,0 +1,26 @@
+"""bookmark http validators
+
+Revision ID: e3a48adccaf5
+Revises: 461eebcdc498
+Create Date: 2026-10-18 09:12:41.208311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e3a48adccaf5"
+down_revision = "461eebcdc498"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("bookmarks", sa.Column("etag", sa.String(255), nullable=True))
+    op.add_column("bookmarks", sa.Column("last_modified", sa.String(50), nullable=True))
+
+
+def downgrade():
+    op.drop_column("bookmarks", "last_modified")
+    op.drop_column("bookmarks", "etag")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Compare fetch throughput of the shared client against a client per call.
+
+    $ python bin/bench_http_client.py http://127.0.0.1:8000/health -n 500 -c 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from dotenv import load_dotenv
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(BASE_DIR, ".env"))
+sys.path.append(BASE_DIR)
+
+from src.bookmarks.utils import fetch_url  # noqa: E402
+from src.http_client import client_session  # noqa: E402
+
+
+async def per_call_fetch(url: str) -> httpx.Response:
+    async with httpx.AsyncClient() as client:
+        return await client.get(url)
+
+
+async def run(fetch, url: str, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await fetch(url)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - start
+
+
+async def main(url: str, requests: int, concurrency: int):
+    elapsed = await run(per_call_fetch, url, requests, concurrency)
+    print(f"per-call client: {requests / elapsed:8.1f} req/s ({elapsed:.2f}s)")
+
+    async with client_session():
+        elapsed = await run(fetch_url, url, requests, concurrency)
+    print(f"shared client:   {requests / elapsed:8.1f} req/s ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("url")
+    parser.add_argument("-n", "--requests", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.requests, args.concurrency))
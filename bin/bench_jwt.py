@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Single-core decode throughput of access tokens.
+
+Compares python-jose with the raw secret (the old path), with the prepared key,
+and the cached path used by ``decode_token``:
+
+    $ python bin/bench_jwt.py -n 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+from jose import jwt
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(BASE_DIR, ".env"))
+sys.path.append(BASE_DIR)
+
+from src.auth.schemas import JWTPayload, SessionCreate, User  # noqa: E402
+from src.auth.utils import to_public_token, token  # noqa: E402
+from src.config import settings  # noqa: E402
+
+
+def raw_decode(token_str: str) -> JWTPayload:
+    return JWTPayload(
+        **jwt.decode(
+            token_str,
+            settings.access_token_secret_key,
+            algorithms=[settings.access_token_algorithm],
+        )
+    )
+
+
+def measure(decode, tokens) -> float:
+    start = time.perf_counter()
+    for token_str in tokens:
+        decode(token_str)
+    return len(tokens) / (time.perf_counter() - start)
+
+
+def main(requests: int, distinct: int):
+    user = User(email="bench@example.com", hashed_password="-")
+    sessions = [SessionCreate(user=user, token=f"token-{i}") for i in range(distinct)]
+    tokens = [to_public_token(s).access_token for s in sessions]
+    tokens = (tokens * (requests // distinct + 1))[:requests]
+
+    uncached = settings.copy(update={"token_cache_size": 0})
+    _, prepared_decode = token(uncached)
+    _, cached_decode = token(settings)
+
+    print(f"{requests} decodes over {distinct} distinct tokens")
+    for name, decode in (
+        ("raw secret", raw_decode),
+        ("prepared key", prepared_decode),
+        ("cached", cached_decode),
+    ):
+        print(f"{name:<13} {measure(decode, tokens):>10.0f} decodes/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--requests", type=int, default=10000)
+    parser.add_argument("-d", "--distinct", type=int, default=100)
+    args = parser.parse_args()
+    main(args.requests, args.distinct)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Latency of /api/bookmarks on its own and during a burst of logins.
+
+Point it at a running server with a valid user:
+
+    $ python bin/bench_login_burst.py http://127.0.0.1:8000 -u me@mail.com -p pass
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    resp = await client.post(
+        "/api/login", data={"username": username, "password": password}
+    )
+    resp.raise_for_status()
+    return resp.json()["access_token"]
+
+
+async def probe(client: httpx.AsyncClient, token: str, requests: int) -> List[float]:
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        resp = await client.get("/api/bookmarks", headers=headers)
+        resp.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, latencies: List[float]):
+    p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:<14} mean {statistics.mean(latencies) * 1000:8.1f} ms  "
+        f"p95 {p95 * 1000:8.1f} ms  max {max(latencies) * 1000:8.1f} ms"
+    )
+
+
+async def main(url: str, username: str, password: str, requests: int, logins: int):
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        token = await login(client, username, password)
+        report("idle", await probe(client, token, requests))
+
+        burst = asyncio.gather(
+            *(login(client, username, password) for _ in range(logins))
+        )
+        report("login burst", await probe(client, token, requests))
+        await burst
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("url")
+    parser.add_argument("-u", "--username", required=True)
+    parser.add_argument("-p", "--password", required=True)
+    parser.add_argument("-n", "--requests", type=int, default=50)
+    parser.add_argument("-l", "--logins", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(
+        main(args.url, args.username, args.password, args.requests, args.logins)
+    )
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Per-page parse time and memory of the HTML metadata parser backends.
+
+Runs every backend over a corpus of saved pages (``*.html`` files):
+
+    $ python bin/bench_parsers.py tmp/pages -r 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(BASE_DIR, ".env"))
+sys.path.append(BASE_DIR)
+
+from src.bookmarks.extractors.parsers import parsers  # noqa: E402
+
+
+def measure(parser, pages, repeat):
+    times = []
+    peaks = []
+    for content in pages:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            parser(content)
+        times.append((time.perf_counter() - start) / repeat)
+
+        tracemalloc.start()
+        parser(content)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return times, peaks
+
+
+def main(corpus: Path, repeat: int):
+    pages = [p.read_text(errors="replace") for p in sorted(corpus.glob("**/*.html"))]
+    if not pages:
+        sys.exit(f"No *.html pages found in {corpus}")
+
+    print(f"{len(pages)} pages, {repeat} runs each")
+    print(
+        f"{'backend':<8} {'mean ms':>9} {'p95 ms':>9} "
+        f"{'mean KiB':>10} {'max KiB':>10}"
+    )
+    for name, parser in parsers.items():
+        times, peaks = measure(parser, pages, repeat)
+        p95 = sorted(times)[int(len(times) * 0.95) - 1 if len(times) > 1 else 0]
+        print(
+            f"{name:<8} {statistics.mean(times) * 1000:>9.3f} {p95 * 1000:>9.3f} "
+            f"{statistics.mean(peaks) / 1024:>10.1f} {max(peaks) / 1024:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("corpus", type=Path)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.corpus, args.repeat)
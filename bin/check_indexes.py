@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""EXPLAIN the hot queries and fail if any of them stops using an index.
+
+Run it against a database with representative data (on near-empty tables
+MySQL may prefer a full scan regardless of the available indexes):
+
+    $ python bin/check_indexes.py
+"""
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(BASE_DIR, ".env"))
+sys.path.append(BASE_DIR)
+
+from src.auth.repos.sessions import delete_expired_query  # noqa: E402
+from src.auth.repos.sessions import get_query as session_query  # noqa: E402
+from src.bookmarks.repos.bookmarks import filter_clause, filtered_query  # noqa: E402
+from src.bookmarks.schemas import (  # noqa: E402
+    BookmarkFilter,
+    OrderedBy,
+    OrderParams,
+    PaginationParams,
+)
+from src.bookmarks.tables import bookmarks  # noqa: E402
+from src.db import engine  # noqa: E402
+
+
+def checks():
+    now = datetime.now(timezone.utc)
+    return {
+        "bookmark list": (
+            "bookmarks",
+            filtered_query(
+                order_params=OrderParams(order_by=OrderedBy.last_fetch_desc),
+                filter_params=BookmarkFilter(only_fetched=True),
+                pagination=PaginationParams(items_per_page=10),
+            ),
+        ),
+        "due to fetch": (
+            "bookmarks",
+            bookmarks.select()
+            .where(filter_clause(BookmarkFilter(is_active=True, due_before=now)))
+            .order_by(bookmarks.c.next_fetch_at, bookmarks.c.id)
+            .limit(20),
+        ),
+        "session lookup": ("sessions", session_query(token="token")),
+        "old sessions": (
+            "sessions",
+            delete_expired_query(now - timedelta(days=30), batch_size=1000),
+        ),
+    }
+
+
+def explain(connection, query):
+    compiled = query.compile(dialect=engine.dialect)
+    result = connection.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)
+    return [dict(row) for row in result.mappings()]
+
+
+def main() -> int:
+    failures = 0
+    with engine.connect() as connection:
+        for name, (table, query) in checks().items():
+            plan = [row for row in explain(connection, query) if row["table"] == table]
+            unindexed = [row for row in plan if not row["key"] or row["type"] == "ALL"]
+            status = "FAIL" if unindexed or not plan else "ok"
+            keys = ", ".join(str(row["key"]) for row in plan) or "-"
+            print(f"{status:<4} {name:<18} {table:<10} key={keys}")
+            failures += status == "FAIL"
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ load_dotenv(os.path.join(BASE_DIR, ".env"))
 from src.db import metadata, engine
 import src.bookmarks.tables
 import src.auth.tables
+import src.common.tables
 metadata.create_all(engine)
 
 # then, load the Alembic configuration and generate the
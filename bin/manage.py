@@ -22,8 +22,22 @@ def execute():
     )
 
 
+def worker():
+    from src.bookmarks.command import run_worker
+
+    run_worker()
+
+
+def rebuild_stats():
+    from src.bookmarks.command import rebuild_stats
+
+    rebuild_stats()
+
+
 action_map = {
     "serve": execute,
+    "worker": worker,
+    "rebuild_stats": rebuild_stats,
 }
 
 if __name__ == "__main__":
@@ -5,12 +5,13 @@ import typer
 from src.auth.schemas import UserCreate
 from src.auth.use_cases.user import create_new_user
 from src.db import connection
+from src.executors import executors_session
 
 app = typer.Typer()
 
 
 async def _create_user(email, password):
-    async with connection():
+    async with connection(), executors_session():
         await create_new_user(UserCreate(email=email, password=password))
 
 
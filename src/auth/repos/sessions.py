@@ -1,12 +1,17 @@
-from typing import Iterable, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
 
 from pymysql import IntegrityError
 from sqlalchemy import or_, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import Delete, Select
 
 from src.auth.exceptions import DuplicatedToken
-from src.auth.schemas import Session, SessionCreate, SessionFilter, User
+from src.auth.schemas import Session, SessionCreate, User
 from src.auth.tables import sessions, users
+from src.common.cache import get_cache
+from src.config import settings
 from src.db import database
 
 
@@ -28,6 +33,52 @@ async def get(
     if id is None and token is None:
         raise ValueError("Id or token are needed to get a session entry")
 
+    # Sessions by token are cached, so authenticated requests skip the join.
+    # The password hash is never loaded with them, so it never reaches the cache.
+    generations = None
+    if id is None:
+        row = await get_cache().get(cache_key(token))
+        if row is not None:
+            return result_mapper(row)
+        # Read before the query: a logout landing in between moves it, and the
+        # deleted session is then not cached back
+        generations = await get_cache().generations(cache_key(token))
+
+    result = await database.fetch_one(get_query(id=id, token=token))
+    if result:
+        session = result_mapper(dict(result))
+        if generations is not None:
+            await cache_session(session, dict(result), generations)
+        return session
+    else:
+        return None
+
+
+def cache_key(token: str) -> str:
+    return f"session:{token}"
+
+
+async def cache_session(session: Session, row: Dict, generations: List[int]):
+    """Cache the row of ``session`` no longer than its access token lifetime.
+
+    The entry is tagged with its own key, so ``delete`` invalidating it also
+    drops a row read before the delete and cached after it.
+    """
+    expires_at = session.created_at.replace(tzinfo=timezone.utc) + timedelta(
+        minutes=settings.access_token_expire_minutes
+    )
+    ttl = (expires_at - datetime.now(timezone.utc)).total_seconds()
+    key = cache_key(session.token)
+    await get_cache().set(
+        key,
+        row,
+        min(ttl, settings.session_cache_seconds),
+        tags=[key],
+        generations=generations,
+    )
+
+
+def get_query(id: Optional[UUID] = None, token: Optional[str] = None) -> Select:
     join = sessions.join(users, sessions.c.user_id == users.c.id)
     query = select(
         [
@@ -36,7 +87,6 @@ async def get(
             users.c.last_login_at,
             users.c.is_active.label("user_is_active"),
             users.c.failed_attempts,
-            users.c.hashed_password,
         ]
     ).select_from(join)
 
@@ -45,57 +95,57 @@ async def get(
     if token:
         query = query.where(sessions.c.token == token)
 
-    result = await database.fetch_one(query)
-    if result:
-        return result_mapper(result)
-    else:
-        return None
+    return query
 
 
-async def filter(filter_params: SessionFilter) -> Iterable[Session]:
-    filters = []
-    if filter_params.user_id:
-        filters.append(sessions.c.user_id == filter_params.user_id)
-    if filter_params.created_before:
-        filters.append(sessions.c.created_at <= filter_params.created_before)
-    if filter_params.is_active is not None:
-        filters.append(sessions.c.is_active == filter_params.is_active)
+async def delete(sessions_: Iterable[Session]):
+    sessions_ = list(sessions_)
+    query = sessions.delete().where(sessions.c.id.in_([s.id for s in sessions_]))
+    _ = await database.execute(query)
+    await get_cache().invalidate(*(cache_key(s.token) for s in sessions_))
 
-    where_clause = or_(*filters)
 
-    join = sessions.join(users, sessions.c.user_id == users.c.id)
-    query = (
-        select(
-            [
-                sessions,
-                users.c.email,
-                users.c.last_login_at,
-                users.c.is_active.label("user_is_active"),
-                users.c.failed_attempts,
-                users.c.hashed_password,
-            ]
-        )
-        .select_from(join)
-        .where(where_clause)
-        .order_by(sessions.c.created_at.desc(), sessions.c.id)
-    )
+async def delete_expired(created_before: datetime, batch_size: int) -> Tuple[int, int]:
+    """Delete sessions created up to ``created_before``, or inactive, in batches.
 
-    result = await database.fetch_all(query)
-    return (result_mapper(r) for r in result)
+    Each batch is a single ``DELETE ... LIMIT`` committed on its own, so locks
+    stay short and no row is ever loaded. Returns the number of deleted rows
+    and of batches run.
+    """
+    query = delete_expired_query(created_before, batch_size)
 
+    deleted = batches = 0
+    async with database.connection():
+        while True:
+            _ = await database.execute(query)
+            count = await database.fetch_val("SELECT ROW_COUNT()")
+            deleted += count
+            batches += 1
+            if count < batch_size:
+                return deleted, batches
 
-async def delete(sessions_: Iterable[Session]):
-    query = sessions.delete().where(sessions.c.id.in_([s.id for s in sessions_]))
-    _ = await database.execute(query)
 
+def delete_expired_query(created_before: datetime, batch_size: int) -> Delete:
+    return sessions.delete(delete_limit=batch_size).where(
+        or_(sessions.c.created_at <= created_before, sessions.c.is_active == False)
+    )
 
-def result_mapper(result) -> Session:
+
+def result_mapper(result: Dict) -> Session:
     user = User(
-        id=result.user_id,
-        email=result.email,
-        last_login_at=result.last_login_at,
-        is_active=result.user_is_active,
-        failed_attempts=result.failed_attempts,
-        hashed_password=result.hashed_password,
+        id=result["user_id"],
+        email=result["email"],
+        last_login_at=result["last_login_at"],
+        is_active=result["user_is_active"],
+        failed_attempts=result["failed_attempts"],
     )
-    return Session(**dict(result), user=user)
+    return Session(**result, user=user)
+
+
+@compiles(Delete)
+def append_limit(delete, compiler, **kw):
+    s = compiler.visit_delete(delete, **kw)
+    limit = delete.kwargs.get("delete_limit")
+    if limit:
+        return f"{s} LIMIT {int(limit)}"
+    return s
@@ -21,7 +21,8 @@ class UserCreate(BaseModel):
 class User(BaseModel):
     id: UUID = Field(default_factory=uuid4)
     email: EmailStr
-    hashed_password: SecretStr
+    # Only loaded by the users repo, never along with a session
+    hashed_password: Optional[SecretStr]
     last_login_at: Optional[datetime]
     is_active: bool = True
     failed_attempts: int = 0
@@ -37,12 +38,6 @@ class PublicAccessToken(BaseModel):
     token_type: str = "bearer"
 
 
-class SessionFilter(BaseModel):
-    user_id: Optional[UUID]
-    created_before: Optional[datetime]
-    is_active: Optional[bool]
-
-
 class Session(BaseModel):
     id: UUID
     user: User
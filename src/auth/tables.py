@@ -24,4 +24,7 @@ sessions = sa.Table(
     sa.Column("token", sa.String(255), unique=True, nullable=False),
     sa.Column("created_at", sa.DateTime, nullable=True),
     sa.Column("is_active", sa.Boolean, default=True),
+    sa.Index("ix_sessions_active_created", "is_active", "created_at"),
+    # Lets pruning merge both indexes for its created_at OR is_active predicate
+    sa.Index("ix_sessions_created", "created_at"),
 )
@@ -1,3 +1,5 @@
+import logging
+import time
 from datetime import datetime, timedelta, timezone
 
 from src.auth.exceptions import (
@@ -13,13 +15,14 @@ from src.auth.schemas import (
     PublicAccessToken,
     Session,
     SessionCreate,
-    SessionFilter,
     User,
 )
 from src.auth.utils import decode_token, is_valid_password, to_public_token
 from src.config import settings
 from src.db import database
 
+logger = logging.getLogger(__name__)
+
 
 async def login(credentials: Credentials) -> PublicAccessToken:
     user = await validate_credentials(credentials)
@@ -47,7 +50,7 @@ async def validate_credentials(credentials: Credentials) -> User:
     if user is None or not user.is_active:
         raise InvalidCredentials
 
-    if not is_valid_password(
+    if not await is_valid_password(
         plain_password=credentials.password, hashed_password=user.hashed_password
     ):
         user.failed_attempts += 1
@@ -105,8 +108,13 @@ async def prune_old_sessions():
     threshold_time = datetime.now(timezone.utc) - timedelta(
         days=settings.remove_sessions_older_than_days
     )
-    session_filter = SessionFilter(created_before=threshold_time, is_active=False)
 
-    async with database.transaction():
-        sessions_to_delete = await sessions.filter(session_filter)
-        await sessions.delete(sessions_to_delete)
+    # Sessions this old expired long ago, so none of them can still be cached
+    start = time.monotonic()
+    deleted, batches = await sessions.delete_expired(
+        created_before=threshold_time, batch_size=settings.session_prune_batch_size
+    )
+    logger.info(
+        f"Pruned {deleted} sessions in {batches} batches "
+        f"({time.monotonic() - start:.2f}s)"
+    )
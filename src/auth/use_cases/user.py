@@ -7,6 +7,6 @@ async def create_new_user(user: UserCreate) -> User:
     return await users.add(
         User(
             email=user.email,
-            hashed_password=hash_password(user.password),
+            hashed_password=await hash_password(user.password),
         )
     )
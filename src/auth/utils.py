@@ -1,47 +1,89 @@
+import time
 from datetime import datetime, timedelta, timezone
 
 from fastapi.encoders import jsonable_encoder
-from jose import ExpiredSignatureError, JWTError, jwt
+from jose import ExpiredSignatureError, JWTError, jwk, jwt
 from passlib.hash import argon2
 from pydantic import SecretStr
 
 from src.auth.exceptions import ExpiredToken, TokenError
 from src.auth.schemas import JWTPayload, PublicAccessToken, Session
+from src.common.cache import TTLCache
 from src.config import Settings, settings
+from src.executors import PASSWORD, run_in_executor
+
+password_hasher = argon2.using(
+    time_cost=settings.argon2_time_cost,
+    memory_cost=settings.argon2_memory_cost,
+    parallelism=settings.argon2_parallelism,
+)
+
+
+async def is_valid_password(
+    plain_password: SecretStr, hashed_password: SecretStr
+) -> bool:
+    return await run_in_executor(
+        PASSWORD,
+        verify_password,
+        plain_password.get_secret_value(),
+        hashed_password.get_secret_value(),
+    )
 
 
-def is_valid_password(plain_password: SecretStr, hashed_password: SecretStr):
-    return argon2.verify(
-        plain_password.get_secret_value(), hashed_password.get_secret_value()
-    )
+async def hash_password(password: SecretStr) -> str:
+    return await run_in_executor(PASSWORD, make_hash, password.get_secret_value())
+
+
+# Blocking halves, run in the password executor (module level to be picklable)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return password_hasher.verify(plain_password, hashed_password)
 
 
-def hash_password(password: SecretStr):
-    return argon2.hash(password.get_secret_value())
+def make_hash(password: str) -> str:
+    return password_hasher.hash(password)
 
 
 def token(settings: Settings):
+    # Built once instead of on every encode/decode
+    key = jwk.construct(
+        settings.access_token_secret_key, algorithm=settings.access_token_algorithm
+    )
+    # Verified payloads by token, so repeated requests skip signature checks
+    verified: TTLCache[JWTPayload] = TTLCache(
+        maxsize=settings.token_cache_size, ttl=settings.token_cache_seconds
+    )
+
     def encode(payload: dict) -> str:
-        return jwt.encode(
-            payload,
-            settings.access_token_secret_key,
-            algorithm=settings.access_token_algorithm,
-        )
+        return jwt.encode(payload, key, algorithm=settings.access_token_algorithm)
 
     def decode(token_str: str, verify_exp=True) -> JWTPayload:
+        payload = verified.get(token_str)
+        if payload is not None:
+            return payload
+
         try:
-            payload = jwt.decode(
+            claims = jwt.decode(
                 token_str,
-                settings.access_token_secret_key,
+                key,
                 algorithms=[settings.access_token_algorithm],
                 options={"verify_exp": verify_exp},
             )
-            return JWTPayload(**payload)
         except ExpiredSignatureError:
             raise ExpiredToken
         except JWTError:
             raise TokenError
 
+        payload = JWTPayload(**claims)
+        # Never serve a payload from the cache past its expiration
+        ttl = settings.token_cache_seconds
+        if payload.exp is not None:
+            ttl = min(ttl, payload.exp - time.time())
+        if ttl > 0:
+            verified.set(token_str, payload, ttl=ttl)
+        return payload
+
     return encode, decode
 
 
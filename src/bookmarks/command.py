@@ -4,11 +4,17 @@ from pathlib import Path
 
 import typer
 
+from src.bookmarks.repos import stats
+from src.bookmarks.schemas import ImportProgress
 from src.bookmarks.use_cases.add_bookmark import (
     import_urls_from_browser_bookmarks,
     update_urls,
 )
+from src.bookmarks.worker import run_scheduler
+from src.common.cache import cache_session
 from src.db import connection
+from src.executors import executors_session
+from src.http_client import client_session
 
 app = typer.Typer()
 
@@ -16,7 +22,7 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 
 
 async def _scrape_batch():
-    async with connection():
+    async with connection(), cache_session(), client_session(), executors_session():
         await update_urls()
 
 
@@ -26,16 +32,52 @@ def scrape_batch():
     print("Scraped!")
 
 
-async def _add_from_file(filepath):
-    async with connection():
-        await import_urls_from_browser_bookmarks(filepath)
+async def _run_worker():
+    async with connection(), cache_session(), client_session(), executors_session():
+        await run_scheduler()
+
+
+@app.command()
+def run_worker():
+    """Run the scraping and session cleanup jobs outside the web workers"""
+    asyncio.run(_run_worker())
+
+
+def _report_progress(progress: ImportProgress):
+    print(
+        f"{progress.found} urls read, {progress.imported} imported, "
+        f"{progress.duplicated} duplicated, {progress.invalid} invalid "
+        f"({progress.urls_per_second:.0f} urls/s)"
+    )
+
+
+async def _add_from_file(filepath) -> ImportProgress:
+    async with connection(), cache_session():
+        return await import_urls_from_browser_bookmarks(
+            filepath, on_progress=_report_progress
+        )
 
 
 @app.command()
 def add_from_file(filename: str):
     filepath = BASE_DIR / Path("tmp") / Path(filename)
-    asyncio.run(_add_from_file(filepath))
-    print("Imported from file!")
+    progress = asyncio.run(_add_from_file(filepath))
+    print(
+        f"Imported from file! {progress.imported} urls "
+        f"in {progress.elapsed_seconds:.1f}s"
+    )
+
+
+async def _rebuild_stats():
+    async with connection(), cache_session():
+        await stats.rebuild()
+
+
+@app.command()
+def rebuild_stats():
+    """Recompute the bookmark stats buckets from the bookmarks table"""
+    asyncio.run(_rebuild_stats())
+    print("Stats rebuilt!")
 
 
 if __name__ == "__main__":
@@ -7,3 +7,8 @@ from src.common.exceptions import BaseError
 class BookmarkNotFound(BaseError):
     def __init__(self, msg: Optional[str] = "Bookmark doesn't exist"):
         super().__init__(msg, 3001, HTTPStatus.UNPROCESSABLE_ENTITY)
+
+
+class InvalidCursor(BaseError):
+    def __init__(self, msg: Optional[str] = "Invalid pagination cursor"):
+        super().__init__(msg, 3002, HTTPStatus.BAD_REQUEST)
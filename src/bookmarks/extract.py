@@ -5,37 +5,49 @@ from typing import Optional
 from httpx import HTTPError
 from pydantic import AnyUrl
 
-from src.bookmarks.extractors import extractor_factory
-from src.bookmarks.schemas import Bookmark
-from src.bookmarks.use_cases.failed_bookmark import url_error
-from src.bookmarks.utils import fetch_url
+from src.bookmarks.extractors import extract_metadata, metadata_to_bookmark
+from src.bookmarks.schemas import ScrapeResult, ScrapeStatus
+from src.bookmarks.utils import conditional_headers, fetch_page, parse_retry_after
+from src.executors import PARSER, run_in_executor
 
 logger = logging.getLogger(__name__)
 
+THROTTLED_STATUSES = (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE)
 
-async def scrape_url(url: AnyUrl) -> Optional[Bookmark]:
+
+async def scrape_url(
+    url: AnyUrl, etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> ScrapeResult:
     try:
-        resp = await fetch_url(url)
+        resp, content = await fetch_page(
+            url, headers=conditional_headers(etag, last_modified)
+        )
 
         if resp.status_code == HTTPStatus.OK:
-            content_type = resp.headers.get("content-type")
-            content = resp.text
-            extractor = extractor_factory(
-                url=url, content=content, content_type=content_type
+            content_type = resp.headers.get("content-type") or ""
+            metadata = await run_in_executor(
+                PARSER, extract_metadata, str(url), content, content_type
+            )
+            bm = metadata_to_bookmark(url, metadata)
+            bm.etag = resp.headers.get("etag")
+            bm.last_modified = resp.headers.get("last-modified")
+            return ScrapeResult(status=ScrapeStatus.scraped, bookmark=bm)
+        elif resp.status_code == HTTPStatus.NOT_MODIFIED:
+            logger.debug(f"Not modified: {url}")
+            return ScrapeResult(status=ScrapeStatus.not_modified)
+        elif resp.status_code in THROTTLED_STATUSES:
+            return ScrapeResult(
+                status=ScrapeStatus.throttled,
+                retry_after=parse_retry_after(resp.headers.get("retry-after")),
             )
-            return extractor.to_bookmark()
         elif resp.status_code == HTTPStatus.GONE:
             logger.debug(f"Content removed: {url}")
         else:
             logger.debug(f"Other response status {resp.status_code}: {url}")
 
-        await url_error(url)
-
     except HTTPError as exc:
         logger.debug(f"Fetch error {url}: {exc}")
-        await url_error(url)
     except Exception as exc:
         logger.debug(f"Unexpected error {url} : {exc}")
-        await url_error(url)
 
-    return None
+    return ScrapeResult(status=ScrapeStatus.failed)
@@ -1,9 +1,7 @@
 import logging
-from typing import Dict, Type
+from typing import Dict, Optional, Type
 
-from bs4 import BeautifulSoup
-
-from src.bookmarks.extractors.base import Extractor
+from src.bookmarks.extractors.base import Extractor, metadata_to_bookmark
 from src.bookmarks.extractors.generics import (
     GenericExtractor,
     ImageExtractor,
@@ -12,6 +10,7 @@ from src.bookmarks.extractors.generics import (
 from src.bookmarks.extractors.github import GithubExtractor
 from src.bookmarks.extractors.google_books import GoogleBooksExtractor
 from src.bookmarks.extractors.medium import MediumExtractor
+from src.bookmarks.extractors.parsers import PageMeta, parse_page
 from src.bookmarks.extractors.youtube import YoutubeExtractor
 from src.bookmarks.schemas import Source
 
@@ -29,13 +28,11 @@ extractors: Dict[Source, Type[Extractor]] = {
 logger = logging.getLogger(__name__)
 
 
-def get_source(page: BeautifulSoup, content_type: str, url: str) -> Source:
+def get_source(page: PageMeta, content_type: str, url: str) -> Source:
     if "image" in content_type:
         logger.debug(f"IMAGE source: {url}")
         return Source.IMAGE
-    source = Extractor.get_attr_or_none(
-        page.find(attrs={"property": "og:site_name"}), "content"
-    )
+    source = page.meta.get("og:site_name")
     if source is None:
         logger.debug(f"UNDEFINED source: {url}")
         return Source.UNDEFINED
@@ -51,8 +48,19 @@ def get_source(page: BeautifulSoup, content_type: str, url: str) -> Source:
 
 
 def extractor_factory(url: str, content: str, content_type: str) -> Extractor:
-    page = BeautifulSoup(content, "html.parser")
+    page = parse_page(content)
     source = get_source(page, content_type, url)
     extractor = extractors[source]
 
     return extractor(url=url, page=page)
+
+
+def extract_metadata(
+    url: str, content: str, content_type: str
+) -> Dict[str, Optional[str]]:
+    """Parse a page into its bookmark metadata.
+
+    Meant to run in the parser executor, so it takes and returns plain values.
+    """
+    extractor = extractor_factory(url=url, content=content, content_type=content_type)
+    return extractor.to_metadata()
@@ -1,63 +1,72 @@
+import hashlib
+import json
 from datetime import datetime, timezone
-from typing import Optional
-
-from bs4 import BeautifulSoup, Tag
+from typing import Dict, Optional
 
+from src.bookmarks.extractors.parsers import PageMeta
 from src.bookmarks.schemas import Bookmark
 
 
 class Extractor:
-    def __init__(self, url: str, page: BeautifulSoup):
+    def __init__(self, url: str, page: PageMeta):
         self.url = url
         self.page = page
+        self.meta = page.meta
 
-    @staticmethod
-    def get_attr_or_none(tag: Optional[Tag], attr: str) -> Optional[str]:
-        if tag is None:
-            return None
-
-        return tag.get(attr)
+    def get_meta(self, *keys: str) -> Optional[str]:
+        """First non-empty meta among ``keys``, looked up in the page's meta index"""
+        for key in keys:
+            value = self.meta.get(key)
+            if value:
+                return value
+        return None
 
     @property
     def title(self):
-        return self.get_attr_or_none(
-            self.page.find(attrs={"property": "og:title"}), "content"
-        ) or " ".join(self.page.find("title").contents)
+        return self.get_meta("og:title") or self.page.title
 
     @property
     def description(self):
-        desc = self.get_attr_or_none(
-            self.page.find(attrs={"property": "og:description"}), "content"
-        )
+        desc = self.get_meta("og:description")
 
         return desc[:500] if desc else desc
 
     @property
     def image_url(self):
-        return self.get_attr_or_none(
-            self.page.find(attrs={"property": "og:image"}), "content"
-        )
+        return self.get_meta("og:image")
 
     @property
     def author(self):
-        return self.get_attr_or_none(
-            self.page.find(attrs={"name": "author"}), "content"
-        ) or self.get_attr_or_none(
-            self.page.find(attrs={"name": "twitter:creator"}), "content"
-        )
+        return self.get_meta("author", "twitter:creator")
 
     @property
     def source(self):
         raise NotImplemented
 
+    def to_metadata(self) -> Dict[str, Optional[str]]:
+        return {
+            "title": self.title,
+            "source": self.source.value,
+            "author": self.author,
+            "description": self.description,
+            "image_url": self.image_url,
+        }
+
     def to_bookmark(self):
-        return Bookmark(
-            title=self.title,
-            url=self.url,
-            source=self.source,
-            author=self.author,
-            description=self.description,
-            image_url=self.image_url,
-            last_fetch_at=datetime.now(timezone.utc),
-            failed_attemtps=0,
-        )
+        return metadata_to_bookmark(self.url, self.to_metadata())
+
+
+def metadata_to_bookmark(url: str, metadata: Dict[str, Optional[str]]) -> Bookmark:
+    return Bookmark(
+        url=url,
+        last_fetch_at=datetime.now(timezone.utc),
+        failed_attempts=0,
+        content_hash=content_hash(metadata),
+        **metadata,
+    )
+
+
+def content_hash(metadata: Dict[str, Optional[str]]) -> str:
+    hasher = hashlib.sha1()
+    hasher.update(json.dumps(metadata, sort_keys=True).encode())
+    return hasher.hexdigest()
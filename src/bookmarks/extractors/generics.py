@@ -19,6 +19,10 @@ class ImageExtractor(Extractor):
     def source(self):
         return Source.IMAGE
 
+    @property
+    def title(self):
+        return self.url.rsplit("/", 1)[-1] or self.url
+
     @property
     def image_url(self):
         return self.url
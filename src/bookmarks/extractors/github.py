@@ -1,23 +1,25 @@
 from src.bookmarks.extractors.base import Extractor
+from src.bookmarks.extractors.parsers import PageMeta
 from src.bookmarks.schemas import Source
 
 
 class GithubExtractor(Extractor):
+    def __init__(self, url: str, page: PageMeta):
+        super().__init__(url, page)
+        # og:title looks like "<owner>/<repo>: <description>"
+        self._og_title = self.get_meta("og:title").split("/")
+
     @property
     def source(self):
         return Source.GITHUB
 
     @property
     def title(self):
-        return self.get_attr_or_none(
-            self.page.find(attrs={"property": "og:title"}), "content"
-        ).split("/")[1]
+        return self._og_title[1]
 
     @property
     def author(self):
-        return self.get_attr_or_none(
-            self.page.find(attrs={"property": "og:title"}), "content"
-        ).split("/")[0]
+        return self._og_title[0]
 
     @property
     def image_url(self):
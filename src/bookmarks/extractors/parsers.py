@@ -0,0 +1,115 @@
+import logging
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+from pydantic import BaseModel
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PageMeta(BaseModel):
+    title: Optional[str]
+    meta: Dict[str, str] = {}
+
+    @property
+    def is_empty(self) -> bool:
+        return self.title is None and not self.meta
+
+
+def index_meta(meta: Dict[str, str], attrs: Dict[str, Optional[str]]):
+    content = attrs.get("content")
+    if content is None:
+        return
+
+    for key in (attrs.get("property"), attrs.get("name")):
+        if key:
+            meta.setdefault(key, content)
+
+
+class _HeadEnd(Exception):
+    pass
+
+
+class MetaCollector(HTMLParser):
+    """Collects ``<meta>`` and ``<title>`` tags in one pass, stopping at ``</head>``.
+
+    Metas are keyed by their ``property`` and ``name`` attributes. As with
+    ``BeautifulSoup.find`` the first occurrence of a key wins.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta: Dict[str, str] = {}
+        self.title: Optional[str] = None
+        self._title_parts: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            index_meta(self.meta, dict(attrs))
+        elif tag == "title" and self.title is None:
+            self._title_parts = []
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._title_parts is not None:
+            self.title = "".join(self._title_parts)
+            self._title_parts = None
+        elif tag == "head":
+            raise _HeadEnd
+
+
+def parse_stream(content: str) -> PageMeta:
+    collector = MetaCollector()
+    try:
+        collector.feed(content)
+        collector.close()
+    except _HeadEnd:
+        pass
+    return PageMeta(title=collector.title, meta=collector.meta)
+
+
+def parse_soup(content: str) -> PageMeta:
+    page = BeautifulSoup(content, "html.parser")
+    meta: Dict[str, str] = {}
+    for tag in page.find_all("meta"):
+        index_meta(meta, tag.attrs)
+
+    title = page.find("title")
+    return PageMeta(title=title.get_text() if title else None, meta=meta)
+
+
+parsers: Dict[str, Callable[[str], PageMeta]] = {
+    "stream": parse_stream,
+    "soup": parse_soup,
+}
+
+
+def parse_page(content: str, backend: str = settings.html_parser_backend) -> PageMeta:
+    """Parse ``content`` with ``backend``, falling back to BeautifulSoup.
+
+    The fallback kicks in when the backend fails or finds nothing in a
+    non-empty document.
+    """
+    parser = parsers[backend]
+    if parser is parse_soup:
+        return parse_soup(content)
+
+    try:
+        page = parser(content)
+    except Exception as exc:
+        logger.debug(f"{backend} parser failed, falling back to soup: {exc}")
+        return parse_soup(content)
+
+    if page.is_empty and content.strip():
+        return parse_soup(content)
+
+    return page
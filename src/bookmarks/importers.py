@@ -0,0 +1,72 @@
+import codecs
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import AsyncIterator, List
+
+import aiofiles
+import ijson
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Firefox stores bookmark urls under "uri", Chrome under "url"
+JSON_URL_KEYS = ("uri", "url")
+
+
+class LinkCollector(HTMLParser):
+    """Collects ``<a href>`` links from a Netscape bookmarks file"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.urls: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.urls.append(href)
+
+    def pop_urls(self) -> List[str]:
+        urls, self.urls = self.urls, []
+        return urls
+
+
+async def iter_json_urls(f) -> AsyncIterator[str]:
+    async for prefix, event, value in ijson.parse(f):
+        if event == "string" and prefix.rsplit(".", 1)[-1] in JSON_URL_KEYS:
+            yield value
+
+
+async def iter_html_urls(f) -> AsyncIterator[str]:
+    collector = LinkCollector()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        chunk = await f.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        collector.feed(decoder.decode(chunk))
+        for url in collector.pop_urls():
+            yield url
+
+    collector.feed(decoder.decode(b"", final=True))
+    collector.close()
+    for url in collector.pop_urls():
+        yield url
+
+
+async def iter_bookmark_urls(path: Path) -> AsyncIterator[str]:
+    """Stream the http(s) urls of a browser bookmarks export.
+
+    Supports Firefox and Chrome JSON backups and Netscape HTML exports; the
+    file is read in chunks so memory stays bounded whatever its size.
+    """
+    async with aiofiles.open(path, "rb") as f:
+        head = await f.read(1024)
+        # Start past a UTF-8 BOM, ijson doesn't skip it
+        bom = codecs.BOM_UTF8 if head.startswith(codecs.BOM_UTF8) else b""
+        await f.seek(len(bom))
+
+        is_json = head[len(bom) :].lstrip().startswith(b"{")
+        urls = iter_json_urls(f) if is_json else iter_html_urls(f)
+        async for url in urls:
+            if url.startswith(("http://", "https://")):
+                yield url
@@ -1,11 +1,17 @@
-from typing import Iterable, Optional, Dict
+import base64
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, List, Optional, Dict, Set, Tuple
 from uuid import UUID
 
-from sqlalchemy import and_, func, or_
+from sqlalchemy import Column, and_, case, func, or_, select
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Query
 from sqlalchemy.sql import Insert
 
+from src.bookmarks import schedule
+from src.bookmarks.exceptions import InvalidCursor
 from src.bookmarks.schemas import (
     Bookmark,
     BookmarkFilter,
@@ -14,20 +20,181 @@ from src.bookmarks.schemas import (
     OrderParams,
 )
 from src.bookmarks.tables import bookmarks
+from src.bookmarks.utils import chunks
+from src.common.cache import get_cache
+from src.config import settings
 from src.db import database
 
+# Everything a scrape refreshes; is_read stays as the user left it
+SCRAPED_COLUMNS = {
+    "id",
+    "url",
+    "url_hash",
+    "title",
+    "source",
+    "author",
+    "description",
+    "image_url",
+    "last_fetch_at",
+    "is_active",
+    "failed_attempts",
+    "etag",
+    "last_modified",
+    "content_hash",
+    "unchanged_fetches",
+    "next_fetch_at",
+    # Insert-only, but MySQL needs it on the INSERT half of the upsert
+    "random_key",
+}
+
+# Written when the row is created, an upsert never changes them afterwards
+INSERT_ONLY_COLUMNS = {"id", "random_key"}
+
+# Tag of every cached read of the bookmarks table, dropped on each write
+CACHE_TAG = "bookmarks"
+
 
 async def add(bookmark: Bookmark) -> Bookmark:
-    query = bookmarks.insert(on_duplicate_key_update=True).values(
-        **bookmark.dict(exclude_none=True)
+    await add_many([bookmark])
+    return bookmark
+
+
+async def add_many(
+    bookmarks_: Iterable[Bookmark],
+    chunk_size: int = settings.bulk_chunk_size,
+    columns: Optional[Set[str]] = None,
+) -> List[Bookmark]:
+    """Upsert ``bookmarks_`` with one multi-row statement per chunk.
+
+    With ``columns`` every row writes exactly those, None values included, so
+    each chunk is a single statement and missing metadata clears stale values.
+    Otherwise only the set fields are written, one statement per set of them;
+    new bookmarks are then due right away and existing ones keep their
+    schedule.
+    """
+    keep = () if columns else ("next_fetch_at",)
+    added = []
+    for chunk in chunks(bookmarks_, chunk_size):
+        chunk = list(chunk)
+        now = datetime.now(timezone.utc)
+        # A multi-row insert needs the same columns on every row
+        rows_by_columns: Dict[Tuple[str, ...], List[Dict]] = {}
+        for bm in chunk:
+            row = bookmark_row(bm, columns)
+            if not columns:
+                row.setdefault("next_fetch_at", now)
+            rows_by_columns.setdefault(tuple(sorted(row)), []).append(row)
+
+        for rows in rows_by_columns.values():
+            _ = await database.execute(upsert_query(rows, keep=keep))
+        added.extend(chunk)
+
+    await get_cache().invalidate(CACHE_TAG)
+    return added
+
+
+def bookmark_row(bookmark: Bookmark, columns: Optional[Set[str]] = None) -> Dict:
+    """Column values of ``bookmark``, exactly ``columns`` or else the set ones"""
+    row = {c.name: getattr(bookmark, c.name, None) for c in bookmarks.c}
+    if columns:
+        return {name: value for name, value in row.items() if name in columns}
+    return {name: value for name, value in row.items() if value is not None}
+
+
+def upsert_query(rows: List[Dict], keep: Iterable[str] = ()):
+    """Multi-row INSERT of ``rows`` that updates the ones already stored.
+
+    The update list is built from the rows' own columns rather than from the
+    compiled INSERT, which SQLAlchemy pads with the columns it has defaults for
+    (and which ``databases`` sends as NULL). Stored rows only take the ``keep``
+    columns where they are NULL.
+    """
+    update = {
+        column: (
+            f"COALESCE({column}, VALUES({column}))"
+            if column in keep
+            else f"VALUES({column})"
+        )
+        for column in rows[0]
+        if column not in INSERT_ONLY_COLUMNS
+    }
+    return bookmarks.insert(on_duplicate_key_update=update).values(rows)
+
+
+async def touch_many(ids: List[UUID], last_fetch_at: datetime):
+    """Record an unchanged fetch, pushing the next one further away"""
+    unchanged_fetches = func.coalesce(bookmarks.c.unchanged_fetches, 0) + 1
+    # MySQL applies SET left to right, so next_fetch_at sees the new counter
+    query = (
+        bookmarks.update()
+        .where(bookmarks.c.id.in_(ids))
+        .ordered_values(
+            (bookmarks.c.last_fetch_at, last_fetch_at),
+            (bookmarks.c.unchanged_fetches, unchanged_fetches),
+            (
+                bookmarks.c.next_fetch_at,
+                schedule.refresh_at_clause(
+                    bookmarks.c.unchanged_fetches, last_fetch_at
+                ),
+            ),
+        )
     )
     _ = await database.execute(query)
-    return bookmark
+    await get_cache().invalidate(CACHE_TAG)
+
+
+async def defer_many(ids: List[UUID], next_fetch_at: datetime):
+    """Postpone the next fetch, leaving every other column untouched"""
+    query = (
+        bookmarks.update()
+        .where(bookmarks.c.id.in_(ids))
+        .values(next_fetch_at=next_fetch_at)
+    )
+    _ = await database.execute(query)
+
+
+async def fail_many(
+    ids: List[UUID], max_failed_attempts: int = settings.max_failed_url_extractions
+):
+    """Count one more failed extraction for every bookmark in ``ids``"""
+    query = (
+        bookmarks.update()
+        .where(bookmarks.c.id.in_(ids))
+        .ordered_values(*failure_values(max_failed_attempts))
+    )
+    _ = await database.execute(query)
+    await get_cache().invalidate(CACHE_TAG)
+
+
+def failure_values(max_failed_attempts: int) -> List[Tuple[Column, Any]]:
+    """SET pairs counting one more failure server-side, in the order to apply them.
+
+    MySQL applies SET left to right: is_active must see the old counter and
+    next_fetch_at the new one, which backs off exponentially with it.
+    """
+    now = datetime.now(timezone.utc)
+    failed_attempts = func.coalesce(bookmarks.c.failed_attempts, 0) + 1
+    return [
+        (
+            bookmarks.c.is_active,
+            case(
+                (failed_attempts >= max_failed_attempts, False),
+                else_=bookmarks.c.is_active,
+            ),
+        ),
+        (bookmarks.c.failed_attempts, failed_attempts),
+        (bookmarks.c.last_fetch_at, now),
+        (
+            bookmarks.c.next_fetch_at,
+            schedule.retry_at_clause(bookmarks.c.failed_attempts, now),
+        ),
+    ]
 
 
 async def delete(bookmark: Bookmark):
     query = bookmarks.delete().where(bookmarks.c.id == bookmark.id)
     _ = await database.execute(query)
+    await get_cache().invalidate(CACHE_TAG)
 
 
 async def all(
@@ -35,19 +202,191 @@ async def all(
     filter_params: Optional[BookmarkFilter] = None,
     pagination: Optional[PaginationParams] = None,
 ) -> Iterable[Bookmark]:
-    query = filtered_query(
-        order_params=order_params, filter_params=filter_params, pagination=pagination
+    if order_params and order_params.order_by == OrderedBy.random:
+        return await random_sample(order_params, filter_params, pagination)
+
+    async def load() -> List[Dict]:
+        query = filtered_query(
+            order_params=order_params,
+            filter_params=filter_params,
+            pagination=pagination,
+        )
+        return [dict(r) for r in await database.fetch_all(query)]
+
+    key = "bookmarks:" + ":".join(
+        params.json() if params else ""
+        for params in (order_params, filter_params, pagination)
+    )
+    rows = await get_cache().get_or_load(
+        key, load, settings.list_cache_seconds, tags=[CACHE_TAG]
+    )
+    return (bookmark_mapper(r) for r in rows)
+
+
+async def random_sample(
+    order_params: OrderParams,
+    filter_params: Optional[BookmarkFilter] = None,
+    pagination: Optional[PaginationParams] = None,
+) -> List[Bookmark]:
+    """Bookmarks in random order, read through the indexed ``random_key``.
+
+    The seed splits the key space: pages walk ``[seed, 1)`` and then wrap
+    around to ``[0, seed)``, so paging with the same seed never repeats or
+    skips an item. The seed is resolved into ``order_params`` for the cursor.
+    Without a cursor, ``current_page`` is honoured with an offset into that
+    same order.
+    """
+    seed_random_order(order_params, pagination)
+    seed = order_params.seed
+    random_key = bookmarks.c.random_key
+    limit = pagination.items_per_page if pagination else None
+
+    after = None
+    wrapped = False
+    offset = 0
+    if pagination and pagination.cursor:
+        _, last_key, last_id = decode_cursor(pagination.cursor, float, float, UUID)
+        after = or_(
+            random_key > last_key,
+            and_(random_key == last_key, bookmarks.c.id > last_id),
+        )
+        wrapped = last_key < seed
+    elif pagination:
+        offset = (pagination.current_page - 1) * pagination.items_per_page
+
+    where_clause = filter_clause(filter_params or BookmarkFilter())
+    segments = [random_key < seed]
+    if not wrapped:
+        segments.insert(0, random_key >= seed)
+
+    items: List[Bookmark] = []
+    for i, segment in enumerate(segments):
+        if where_clause is not None:
+            segment = and_(segment, where_clause)
+
+        if offset and i < len(segments) - 1:
+            # Skip the whole segment when the offset lands past its end
+            size = await database.fetch_val(
+                select([func.count()]).select_from(bookmarks).where(segment)
+            )
+            if offset >= size:
+                offset -= size
+                continue
+
+        query = bookmarks.select().where(segment)
+        if after is not None:
+            query = query.where(after)
+            after = None
+        if limit:
+            query = query.limit(limit - len(items))
+        if offset:
+            query = query.offset(offset)
+            offset = 0
+
+        result = await database.fetch_all(query.order_by(random_key, bookmarks.c.id))
+        items.extend(bookmark_mapper(dict(r)) for r in result)
+        if limit and len(items) >= limit:
+            break
+
+    return items
+
+
+def seed_random_order(
+    order_params: OrderParams, pagination: Optional[PaginationParams] = None
+):
+    if pagination and pagination.cursor:
+        order_params.seed = decode_cursor(pagination.cursor, float, float, UUID)[0]
+    elif order_params.seed is None:
+        order_params.seed = random.random()
+
+
+async def claim(
+    owner: str,
+    limit: int,
+    lease_seconds: int,
+    filter_params: Optional[BookmarkFilter] = None,
+) -> List[Bookmark]:
+    """Atomically lease up to ``limit`` matching bookmarks to ``owner``.
+
+    Rows locked or leased by another worker are skipped, so concurrent workers
+    never get the same bookmark. A lease that is not released (e.g. the worker
+    died) expires after ``lease_seconds`` and the row becomes claimable again.
+    """
+    now = datetime.now(timezone.utc)
+    query = bookmarks.select()
+    where_clause = filter_clause(filter_params or BookmarkFilter())
+    if where_clause is not None:
+        query = query.where(where_clause)
+    query = (
+        query.where(
+            or_(bookmarks.c.claimed_until == None, bookmarks.c.claimed_until < now)
+        )
+        # Most overdue first
+        .order_by(bookmarks.c.next_fetch_at, bookmarks.c.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
     )
 
-    result = await database.fetch_all(query)
-    return (bookmark_mapper(dict(r)) for r in result)
+    async with database.transaction():
+        result = await database.fetch_all(query)
+        ids = [r["id"] for r in result]
+        if ids:
+            _ = await database.execute(
+                bookmarks.update()
+                .where(bookmarks.c.id.in_(ids))
+                .values(
+                    claimed_by=owner,
+                    claimed_until=now + timedelta(seconds=lease_seconds),
+                )
+            )
+
+    return [bookmark_mapper(dict(r)) for r in result]
+
+
+async def renew(bookmarks_: Iterable[Bookmark], owner: str, lease_seconds: int):
+    """Extend the lease ``owner`` still holds on ``bookmarks_``"""
+    ids = [bm.id for bm in bookmarks_]
+    if not ids:
+        return
+
+    now = datetime.now(timezone.utc)
+    query = (
+        bookmarks.update()
+        .where(bookmarks.c.id.in_(ids), bookmarks.c.claimed_by == owner)
+        .values(claimed_until=now + timedelta(seconds=lease_seconds))
+    )
+    _ = await database.execute(query)
+
+
+async def release(bookmarks_: Iterable[Bookmark], owner: str):
+    ids = [bm.id for bm in bookmarks_]
+    if not ids:
+        return
+
+    query = (
+        bookmarks.update()
+        .where(bookmarks.c.id.in_(ids), bookmarks.c.claimed_by == owner)
+        .values(claimed_by=None, claimed_until=None)
+    )
+    _ = await database.execute(query)
 
 
 async def count(filter_params: Optional[BookmarkFilter] = None) -> int:
-    # query = filtered_query(filter_params=filter_params).alias("t").count()
-    # rs = await database.fetch_one(query)
-    # return rs.tbl_row_count
-    return 0 # TODO: FIX this. new sqlalchemy doesn't have .count method
+    filter_params = filter_params or BookmarkFilter()
+
+    async def load() -> int:
+        query = select([func.count()]).select_from(bookmarks)
+        where_clause = filter_clause(filter_params)
+        if where_clause is not None:
+            query = query.where(where_clause)
+        return await database.fetch_val(query)
+
+    return await get_cache().get_or_load(
+        f"count:{filter_params.json()}",
+        load,
+        settings.count_cache_seconds,
+        tags=[CACHE_TAG],
+    )
 
 
 async def get(
@@ -88,19 +427,91 @@ def bookmark_mapper(result: Dict) -> Bookmark:
         last_fetch_at=result["last_fetch_at"],
         is_active=result["is_active"],
         failed_attempts=result["failed_attempts"],
-        is_read=result["is_read"]
+        is_read=result["is_read"],
+        etag=result["etag"],
+        last_modified=result["last_modified"],
+        random_key=result["random_key"],
+        content_hash=result["content_hash"],
+        unchanged_fetches=result["unchanged_fetches"] or 0,
+        next_fetch_at=result["next_fetch_at"],
     )
 
+
 def filtered_query(
     order_params: Optional[OrderedBy] = None,
     filter_params: Optional[BookmarkFilter] = None,
     pagination: Optional[PaginationParams] = None,
 ) -> Query:
-    filter_params = filter_params or BookmarkFilter()
+    query = bookmarks.select()
+
+    where_clause = filter_clause(filter_params or BookmarkFilter())
+    if where_clause is not None:
+        query = query.where(where_clause)
+
+    order_by = order_params.order_by if order_params else OrderedBy.last_fetch_desc
+
+    if order_by == OrderedBy.random:
+        # Unpaged random order; paged random reads go through random_sample
+        query = query.order_by(bookmarks.c.random_key, bookmarks.c.id)
+        return query
+
+    if pagination and pagination.cursor:
+        query = query.where(cursor_clause(pagination.cursor, order_by)).limit(
+            pagination.items_per_page
+        )
+    elif pagination:
+        query = query.limit(pagination.items_per_page).offset(
+            (pagination.current_page - 1) * pagination.items_per_page
+        )
+
+    if order_by == OrderedBy.last_fetch_asc:
+        query = query.order_by(bookmarks.c.last_fetch_at, bookmarks.c.id)
+    else:
+        # Same direction on both keys so MySQL can scan the index backwards
+        query = query.order_by(bookmarks.c.last_fetch_at.desc(), bookmarks.c.id.desc())
+
+    return query
+
+
+def encode_cursor(
+    bookmark: Bookmark, order_params: Optional[OrderParams] = None
+) -> str:
+    """Opaque keyset cursor pointing right after ``bookmark``"""
+    if order_params and order_params.order_by == OrderedBy.random:
+        position = [order_params.seed, bookmark.random_key, str(bookmark.id)]
+    else:
+        position = [bookmark.last_fetch_at.isoformat(), str(bookmark.id)]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor: str, *parsers: Callable) -> Tuple:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(position) != len(parsers):
+            raise ValueError("Unexpected cursor length")
+        return tuple(parse(value) for parse, value in zip(parsers, position))
+    except Exception:
+        raise InvalidCursor
+
+
+def cursor_clause(cursor: str, order_by: OrderedBy):
+    last_fetch_at, id = decode_cursor(cursor, datetime.fromisoformat, UUID)
+    if order_by == OrderedBy.last_fetch_asc:
+        after = bookmarks.c.last_fetch_at > last_fetch_at
+        tie = bookmarks.c.id > id
+    else:
+        after = bookmarks.c.last_fetch_at < last_fetch_at
+        tie = bookmarks.c.id < id
+
+    return or_(after, and_(bookmarks.c.last_fetch_at == last_fetch_at, tie))
 
+
+def filter_clause(filter_params: BookmarkFilter):
     filters = []
     if filter_params.last_fetched_before:
         filters.append(bookmarks.c.last_fetch_at <= filter_params.last_fetched_before)
+    if filter_params.due_before:
+        filters.append(bookmarks.c.next_fetch_at <= filter_params.due_before)
     if filter_params.source:
         filters.append(bookmarks.c.source == filter_params.source)
     if filter_params.author:
@@ -126,36 +537,14 @@ def filtered_query(
         else:
             where_clause = w
 
-    query = bookmarks.select()
-
-    if where_clause is not None:
-        query = query.where(where_clause)
-
-    if pagination:
-        query = query.limit(pagination.items_per_page).offset(
-            (pagination.current_page - 1) * pagination.items_per_page
-        )
-
-    if order_params:
-        if order_params.order_by == OrderedBy.random:
-            query = query.order_by(func.rand())
-        elif order_params.order_by == OrderedBy.last_fetch_asc:
-            query = query.order_by(bookmarks.c.last_fetch_at, bookmarks.c.id)
-        elif order_params.order_by == OrderedBy.last_fetch_desc:
-            query = query.order_by(bookmarks.c.last_fetch_at.desc(), bookmarks.c.id)
-    else:
-        query = query.order_by(bookmarks.c.last_fetch_at.desc(), bookmarks.c.id)
-
-    return query
+    return where_clause
 
 
 @compiles(Insert)
 def append_string(insert, compiler, **kw):
     s = compiler.visit_insert(insert, **kw)
-    if insert.kwargs.get("on_duplicate_key_update"):
-        fields = s[s.find("(") + 1 : s.find(")")].replace(" ", "").split(",")
-        generated_directive = [
-            "{0}=VALUES({0})".format(field) for field in fields if field != "id"
-        ]
-        return s + " ON DUPLICATE KEY UPDATE " + ",".join(generated_directive)
+    update = insert.kwargs.get("on_duplicate_key_update")
+    if update:
+        directives = [f"{column}={value}" for column, value in update.items()]
+        return s + " ON DUPLICATE KEY UPDATE " + ",".join(directives)
     return s
@@ -0,0 +1,45 @@
+from typing import Dict, List
+
+from sqlalchemy import and_, case, func, literal_column, select
+
+from src.bookmarks.repos.bookmarks import CACHE_TAG
+from src.bookmarks.tables import bookmark_stats, bookmarks
+from src.common.cache import get_cache
+from src.db import database
+
+
+def aggregate_query():
+    """Stats buckets computed straight from ``bookmarks`` in one scan"""
+    source = func.coalesce(bookmarks.c.source, literal_column("''"))
+    is_read = func.coalesce(bookmarks.c.is_read, False)
+    pending = and_(bookmarks.c.last_fetch_at == None, bookmarks.c.is_active == True)
+    inactive = bookmarks.c.is_active == False
+
+    return select(
+        [
+            source.label("source"),
+            is_read.label("is_read"),
+            func.count().label("total"),
+            func.sum(case((pending, 1), else_=0)).label("pending"),
+            func.sum(case((inactive, 1), else_=0)).label("inactive"),
+        ]
+    ).group_by(source, is_read)
+
+
+async def all() -> List[Dict]:
+    query = bookmark_stats.select().where(bookmark_stats.c.total > 0)
+    result = await database.fetch_all(query)
+    return [dict(r) for r in result]
+
+
+async def rebuild():
+    """Recompute the materialized buckets, e.g. after bulk changes bypassing triggers"""
+    async with database.transaction():
+        _ = await database.execute(bookmark_stats.delete())
+        _ = await database.execute(
+            bookmark_stats.insert().from_select(
+                ["source", "is_read", "total", "pending", "inactive"],
+                aggregate_query(),
+            )
+        )
+    await get_cache().invalidate(CACHE_TAG)
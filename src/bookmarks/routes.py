@@ -30,17 +30,27 @@ async def bookmarks_handler(
     current_page: int = Query(default=1),
     items_per_page: int = Query(default=DEFAULT_ITEMS_PER_PAGE),
     order_by: Optional[OrderedBy] = Query(default=OrderedBy.last_fetch_desc),
+    cursor: Optional[str] = Query(default=None),
+    seed: Optional[float] = Query(default=None, ge=0, lt=1),
     session: Session = Depends(get_current_session),
 ):
-    order_params = OrderParams(order_by=order_by)
+    order_params = OrderParams(order_by=order_by, seed=seed)
     pagination = PaginationParams(
-        current_page=current_page, items_per_page=items_per_page
+        current_page=current_page, items_per_page=items_per_page, cursor=cursor
     )
     filter_params = BookmarkFilter(only_fetched=True)
-    items = await bookmarks.all(
-        order_params=order_params, filter_params=filter_params, pagination=pagination
+    items = list(
+        await bookmarks.all(
+            order_params=order_params,
+            filter_params=filter_params,
+            pagination=pagination,
+        )
     )
 
+    next_cursor = None
+    if len(items) == items_per_page:
+        next_cursor = bookmarks.encode_cursor(items[-1], order_params)
+
     total_num_items = await bookmarks.count(filter_params=filter_params)
     pagination = get_pagination(
         current_page=pagination.current_page,
@@ -48,7 +58,7 @@ async def bookmarks_handler(
         total_num_items=total_num_items,
     )
 
-    return BookmarkResponse(items=items, pagination=pagination)
+    return BookmarkResponse(items=items, pagination=pagination, next_cursor=next_cursor)
 
 
 @router.get("/api/bookmarks/stats", response_model=BookmarkStats)
@@ -0,0 +1,84 @@
+"""When every bookmark should be fetched again.
+
+Failures back off exponentially from ``fetch_retry_base_seconds`` and pages
+whose content didn't change since the last fetch wait exponentially longer
+than ``refresh_urls_older_than_days``. Both delays are capped and jittered so
+bookmarks imported together don't stay due together.
+"""
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func, literal_column
+
+from src.config import settings
+
+DAY_SECONDS = 24 * 3600
+
+
+def backoff_seconds(base: float, cap: float, exponent: int) -> float:
+    return min(base * 2 ** max(exponent, 0), cap)
+
+
+def jitter(seconds: float) -> float:
+    spread = settings.fetch_schedule_jitter
+    return seconds * (1 + spread * (2 * random.random() - 1))
+
+
+def retry_seconds(failed_attempts: int) -> float:
+    return backoff_seconds(
+        settings.fetch_retry_base_seconds,
+        settings.fetch_retry_max_seconds,
+        failed_attempts - 1,
+    )
+
+
+def refresh_seconds(unchanged_fetches: int) -> float:
+    return backoff_seconds(
+        settings.refresh_urls_older_than_days * DAY_SECONDS,
+        settings.refresh_urls_max_days * DAY_SECONDS,
+        unchanged_fetches,
+    )
+
+
+def next_refresh_at(unchanged_fetches: int, now: Optional[datetime] = None) -> datetime:
+    now = now or datetime.now(timezone.utc)
+    return now + timedelta(seconds=jitter(refresh_seconds(unchanged_fetches)))
+
+
+def next_unthrottled_at(
+    retry_after: Optional[float], now: Optional[datetime] = None
+) -> datetime:
+    """When to come back to a host that kept throttling us (whole seconds)"""
+    now = (now or datetime.now(timezone.utc)).replace(microsecond=0)
+    seconds = max(retry_after or 0, jitter(retry_seconds(1)))
+    return now + timedelta(seconds=math.ceil(seconds))
+
+
+# Server-side versions, for updates that only know the counters inside the DB
+
+
+def backoff_clause(base: float, cap: float, exponent, now: datetime):
+    seconds = func.least(base * func.pow(2, func.greatest(exponent, 0)), cap)
+    spread = settings.fetch_schedule_jitter
+    seconds = seconds * (1 + spread * (2 * func.rand() - 1))
+    return func.timestampadd(literal_column("SECOND"), func.round(seconds), now)
+
+
+def retry_at_clause(failed_attempts, now: datetime):
+    return backoff_clause(
+        settings.fetch_retry_base_seconds,
+        settings.fetch_retry_max_seconds,
+        failed_attempts - 1,
+        now,
+    )
+
+
+def refresh_at_clause(unchanged_fetches, now: datetime):
+    return backoff_clause(
+        settings.refresh_urls_older_than_days * DAY_SECONDS,
+        settings.refresh_urls_max_days * DAY_SECONDS,
+        unchanged_fetches,
+        now,
+    )
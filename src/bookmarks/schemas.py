@@ -1,7 +1,8 @@
 import hashlib
+import random
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID, uuid4
 
 from pydantic import AnyHttpUrl, BaseModel, Field, validator
@@ -38,6 +39,8 @@ class BookmarkStats(BaseModel):
     total: int
     inactive: int
     available: int
+    by_source: Dict[str, int] = {}
+    by_read_state: Dict[str, int] = {}
 
 
 class OrderedBy(str, Enum):
@@ -48,11 +51,13 @@ class OrderedBy(str, Enum):
 
 class OrderParams(BaseModel):
     order_by: Optional[OrderedBy]
+    seed: Optional[float]
 
 
 class PaginationParams(BaseModel):
     items_per_page: int
-    current_page: int
+    current_page: int = 1
+    cursor: Optional[str]
 
 
 class Url(BaseModel):
@@ -67,6 +72,7 @@ class BookmarkFilter(BaseModel):
     is_active: Optional[bool]
     is_read: Optional[bool]
     last_fetched_before: Optional[datetime]
+    due_before: Optional[datetime]
     pending_to_fetch: Optional[bool]
     only_fetched: Optional[bool]
 
@@ -85,6 +91,13 @@ class Bookmark(BaseModel):
     is_active: bool = True
     failed_attempts: int = 0
     is_read: bool = False
+    # Crawler bookkeeping, stored but not served by the API
+    etag: Optional[str] = Field(exclude=True)
+    last_modified: Optional[str] = Field(exclude=True)
+    random_key: float = Field(default_factory=random.random, exclude=True)
+    content_hash: Optional[str] = Field(exclude=True)
+    unchanged_fetches: int = Field(0, exclude=True)
+    next_fetch_at: Optional[datetime] = Field(exclude=True)
 
     @validator("url_hash", pre=True, always=True)
     def url_hasher(cls, v, values, **kwargs):
@@ -101,6 +114,32 @@ class Bookmark(BaseModel):
         return v
 
 
+class ImportProgress(BaseModel):
+    found: int = 0
+    imported: int = 0
+    duplicated: int = 0
+    invalid: int = 0
+    elapsed_seconds: float = 0
+
+    @property
+    def urls_per_second(self) -> float:
+        return self.found / self.elapsed_seconds if self.elapsed_seconds else 0
+
+
+class ScrapeStatus(str, Enum):
+    scraped = "scraped"
+    not_modified = "not_modified"
+    throttled = "throttled"
+    failed = "failed"
+
+
+class ScrapeResult(BaseModel):
+    status: ScrapeStatus
+    bookmark: Optional[Bookmark]
+    retry_after: Optional[float]
+
+
 class BookmarkResponse(BaseModel):
     items: List[Bookmark]
     pagination: Optional[PaginationResult]
+    next_cursor: Optional[str]
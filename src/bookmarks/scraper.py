@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from itertools import zip_longest
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+from uuid import UUID
+
+from src.bookmarks import schedule
+from src.bookmarks.extract import scrape_url
+from src.bookmarks.repos import bookmarks
+from src.bookmarks.schemas import Bookmark, ScrapeResult, ScrapeStatus
+from src.common.cache import TTLCache
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+Persist = Callable[[Bookmark, ScrapeResult], Awaitable[None]]
+
+# Idle hosts are forgotten after a day
+HOST_THROTTLE_TTL_SECONDS = 24 * 3600
+
+
+class HostThrottle:
+    """Adaptive token bucket for a single host.
+
+    Requests spend a token; tokens refill at ``rate`` per second up to
+    ``burst``. A throttled response (429/503) pauses the host for its
+    ``Retry-After`` and halves the rate, which then creeps back up to the base
+    rate with every successful request.
+    """
+
+    def __init__(self, rate: float, burst: int, min_rate: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                elapsed = now - self.updated_at
+                self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def throttled(self, retry_after: Optional[float] = None):
+        self.rate = max(self.min_rate, self.rate / 2)
+        pause = retry_after if retry_after is not None else 1 / self.rate
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+        self.tokens = 0
+
+    def succeeded(self):
+        self.rate = min(self.base_rate, self.rate + self.base_rate / 10)
+
+    @property
+    def pause_remaining(self) -> float:
+        return max(0.0, self.paused_until - time.monotonic())
+
+
+# Shared by every engine in the process, so a host's pause and reduced rate
+# carry over from one batch to the next
+host_throttles: TTLCache[HostThrottle] = TTLCache(
+    maxsize=10000, ttl=HOST_THROTTLE_TTL_SECONDS
+)
+
+
+class ScrapeEngine:
+    """Scrapes many bookmarks at once while staying polite to every host.
+
+    A global semaphore caps the number of in-flight scrapes, and per host a
+    semaphore caps concurrent requests and a ``HostThrottle`` paces them.
+    Entries are interleaved across hosts so one big host doesn't starve the
+    others. Every bookmark runs fetch, parse and persist on its own task, so
+    results are persisted as soon as they are ready and a hanging host only
+    times out its own tasks.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = settings.scrape_concurrency,
+        per_host_concurrency: int = settings.scrape_concurrency_per_host,
+        timeout: float = settings.scrape_url_timeout_seconds,
+        host_rate: float = settings.scrape_host_rate,
+        host_burst: int = settings.scrape_host_burst,
+        max_retries: int = settings.scrape_max_retries,
+        max_retry_wait: float = settings.scrape_max_retry_wait_seconds,
+    ):
+        self.timeout = timeout
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+        self._global = asyncio.Semaphore(concurrency)
+        self._hosts: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(per_host_concurrency)
+        )
+
+    @staticmethod
+    def host(url: str) -> str:
+        return (urlsplit(url).hostname or "").lower()
+
+    def throttle(self, host: str) -> HostThrottle:
+        throttle = host_throttles.get(host)
+        if throttle is None:
+            throttle = HostThrottle(
+                self.host_rate, self.host_burst, min_rate=self.host_rate / 16
+            )
+        # Set on every use to keep active hosts from expiring
+        host_throttles.set(host, throttle)
+        return throttle
+
+    def interleave(self, entries: Iterable[Bookmark]) -> List[Bookmark]:
+        by_host: Dict[str, List[Bookmark]] = defaultdict(list)
+        for bm in entries:
+            by_host[self.host(bm.url)].append(bm)
+
+        return [bm for round_ in zip_longest(*by_host.values()) for bm in round_ if bm]
+
+    async def scrape(self, bookmark: Bookmark) -> ScrapeResult:
+        host = self.host(bookmark.url)
+        throttle = self.throttle(host)
+        # Waiting on the host first keeps a crowded host from holding global slots
+        async with self._hosts[host]:
+            for _ in range(self.max_retries + 1):
+                if throttle.pause_remaining > self.max_retry_wait:
+                    break
+                await throttle.acquire()
+                async with self._global:
+                    result = await self._scrape_once(bookmark)
+
+                if result.status != ScrapeStatus.throttled:
+                    if result.status != ScrapeStatus.failed:
+                        throttle.succeeded()
+                    return result
+
+                logger.debug(f"Throttled by {host}, retry after {result.retry_after}")
+                throttle.throttled(result.retry_after)
+
+        # Deferred until the host accepts requests again, without counting it as
+        # a failure
+        return ScrapeResult(
+            status=ScrapeStatus.throttled, retry_after=throttle.pause_remaining
+        )
+
+    async def _scrape_once(self, bookmark: Bookmark) -> ScrapeResult:
+        try:
+            return await asyncio.wait_for(
+                scrape_url(
+                    bookmark.url,
+                    etag=bookmark.etag,
+                    last_modified=bookmark.last_modified,
+                ),
+                timeout=self.timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.debug(f"Timeout scraping {bookmark.url}")
+            return ScrapeResult(status=ScrapeStatus.failed)
+
+    async def _process(self, bookmark: Bookmark, persist: Persist) -> bool:
+        logger.info(f"Scraping... {bookmark.url}")
+        result = await self.scrape(bookmark)
+        await persist(bookmark, result)
+        return result.status == ScrapeStatus.scraped
+
+    async def run(self, entries: Iterable[Bookmark], persist: Persist) -> int:
+        """Scrape every entry and hand its result to ``persist`` as it finishes.
+
+        Returns the number of bookmarks scraped successfully.
+        """
+        tasks = [
+            asyncio.create_task(self._process(bm, persist))
+            for bm in self.interleave(entries)
+        ]
+        scraped = 0
+        for task in asyncio.as_completed(tasks):
+            try:
+                scraped += await task
+            except Exception as exc:
+                logger.error(f"Error when scrapping: {exc}")
+
+        return scraped
+
+
+class ScrapeResultBuffer:
+    """Write-behind buffer for scrape results.
+
+    Results pile up in memory and are written in bulk once ``flush_size`` of
+    them are waiting (and on the final ``flush``): one multi-row upsert for
+    the scraped bookmarks, one UPDATE for the unmodified ones, one for the
+    failed ones and one per retry time for the throttled ones. Each of them
+    also schedules the bookmark's next fetch.
+    """
+
+    def __init__(self, flush_size: int = settings.scrape_flush_size):
+        self.flush_size = flush_size
+        self._scraped: List[Bookmark] = []
+        self._not_modified: List[UUID] = []
+        self._failed: List[UUID] = []
+        self._throttled: Dict[datetime, List[UUID]] = defaultdict(list)
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return (
+            len(self._scraped)
+            + len(self._not_modified)
+            + len(self._failed)
+            + sum(len(ids) for ids in self._throttled.values())
+        )
+
+    async def add(self, entry: Bookmark, result: ScrapeResult):
+        if result.status == ScrapeStatus.scraped:
+            bm = result.bookmark
+            bm.id = entry.id
+            if entry.content_hash and bm.content_hash == entry.content_hash:
+                bm.unchanged_fetches = entry.unchanged_fetches + 1
+            bm.next_fetch_at = schedule.next_refresh_at(
+                bm.unchanged_fetches, bm.last_fetch_at
+            )
+            self._scraped.append(bm)
+        elif result.status == ScrapeStatus.not_modified:
+            self._not_modified.append(entry.id)
+        elif result.status == ScrapeStatus.failed:
+            self._failed.append(entry.id)
+        elif result.status == ScrapeStatus.throttled:
+            # Pushed back so a throttling host can't keep heading every batch
+            retry_at = schedule.next_unthrottled_at(result.retry_after)
+            self._throttled[retry_at].append(entry.id)
+
+        if len(self) >= self.flush_size:
+            await self.flush()
+
+    async def flush(self):
+        async with self._lock:
+            scraped, self._scraped = self._scraped, []
+            not_modified, self._not_modified = self._not_modified, []
+            failed, self._failed = self._failed, []
+            throttled, self._throttled = self._throttled, defaultdict(list)
+
+            if scraped:
+                try:
+                    await bookmarks.add_many(scraped, columns=bookmarks.SCRAPED_COLUMNS)
+                except Exception as exc:
+                    logger.error(f"Error when scrapping: {exc}")
+                    failed.extend(bm.id for bm in scraped)
+            if not_modified:
+                await bookmarks.touch_many(not_modified, datetime.now(timezone.utc))
+            if failed:
+                await bookmarks.fail_many(failed)
+            for retry_at, ids in throttled.items():
+                await bookmarks.defer_many(ids, retry_at)
@@ -3,6 +3,7 @@ from fastapi_utils.guid_type import GUID
 
 from src.db import metadata
 
+# No Python-side defaults: ``databases`` doesn't run them and would send NULL
 bookmarks = sa.Table(
     "bookmarks",
     metadata,
@@ -15,7 +16,81 @@ bookmarks = sa.Table(
     sa.Column("description", sa.String(500), nullable=True),
     sa.Column("image_url", sa.String(500), nullable=True),
     sa.Column("last_fetch_at", sa.DateTime, nullable=True),
-    sa.Column("is_active", sa.Boolean, default=True),
-    sa.Column("failed_attempts", sa.Integer, default=0),
-    sa.Column("is_read", sa.Boolean, default=False),
+    sa.Column("is_active", sa.Boolean),
+    sa.Column("failed_attempts", sa.Integer),
+    sa.Column("is_read", sa.Boolean),
+    sa.Column("etag", sa.String(255), nullable=True),
+    sa.Column("last_modified", sa.String(50), nullable=True),
+    sa.Column("claimed_by", sa.String(64), nullable=True),
+    sa.Column("claimed_until", sa.DateTime, nullable=True),
+    sa.Column("random_key", sa.Float(53), nullable=False),
+    sa.Column("content_hash", sa.String(40), nullable=True),
+    sa.Column("unchanged_fetches", sa.Integer),
+    sa.Column("next_fetch_at", sa.DateTime, nullable=True),
+    sa.Index("ix_bookmarks_random_key", "random_key"),
+    # Listing (only fetched), pending to fetch and refresh windows
+    sa.Index("ix_bookmarks_active_fetch", "is_active", "last_fetch_at", "id"),
+    sa.Index("ix_bookmarks_source_fetch", "source", "last_fetch_at"),
+    sa.Index("ix_bookmarks_author_fetch", "author", "last_fetch_at"),
+    sa.Index("ix_bookmarks_read_fetch", "is_read", "last_fetch_at"),
+    sa.Index("ix_bookmarks_active_next_fetch", "is_active", "next_fetch_at"),
 )
+
+# One row per (source, is_read) bucket, kept in sync with ``bookmarks`` by the
+# triggers below so stats never have to scan the bookmarks table.
+bookmark_stats = sa.Table(
+    "bookmark_stats",
+    metadata,
+    sa.Column("source", sa.String(50), primary_key=True),
+    sa.Column("is_read", sa.Boolean, primary_key=True),
+    sa.Column("total", sa.Integer, nullable=False, default=0),
+    sa.Column("pending", sa.Integer, nullable=False, default=0),
+    sa.Column("inactive", sa.Integer, nullable=False, default=0),
+)
+
+
+def _bucket(row: str) -> str:
+    return f"COALESCE({row}.source, ''), COALESCE({row}.is_read, 0)"
+
+
+def _pending(row: str) -> str:
+    return f"COALESCE({row}.last_fetch_at IS NULL AND {row}.is_active = 1, 0)"
+
+
+def _inactive(row: str) -> str:
+    return f"COALESCE({row}.is_active = 0, 0)"
+
+
+def _add_to_stats(row: str) -> str:
+    return (
+        "INSERT INTO bookmark_stats (source, is_read, total, pending, inactive) "
+        f"VALUES ({_bucket(row)}, 1, {_pending(row)}, {_inactive(row)}) "
+        "ON DUPLICATE KEY UPDATE total = total + 1, "
+        "pending = pending + VALUES(pending), inactive = inactive + VALUES(inactive)"
+    )
+
+
+def _remove_from_stats(row: str) -> str:
+    return (
+        "UPDATE bookmark_stats SET total = total - 1, "
+        f"pending = pending - {_pending(row)}, inactive = inactive - {_inactive(row)} "
+        f"WHERE (source, is_read) = ({_bucket(row)})"
+    )
+
+
+stats_triggers = [
+    "CREATE TRIGGER bookmark_stats_insert AFTER INSERT ON bookmarks "
+    f"FOR EACH ROW {_add_to_stats('NEW')}",
+    "CREATE TRIGGER bookmark_stats_delete AFTER DELETE ON bookmarks "
+    f"FOR EACH ROW {_remove_from_stats('OLD')}",
+    "CREATE TRIGGER bookmark_stats_update AFTER UPDATE ON bookmarks "
+    "FOR EACH ROW BEGIN "
+    f"IF NOT (({_bucket('OLD')}) <=> ({_bucket('NEW')}) "
+    f"AND {_pending('OLD')} = {_pending('NEW')} "
+    f"AND {_inactive('OLD')} = {_inactive('NEW')}) THEN "
+    f"{_remove_from_stats('OLD')}; {_add_to_stats('NEW')}; "
+    "END IF; END",
+]
+
+for trigger in stats_triggers:
+    sa.event.listen(bookmarks, "after_create", sa.DDL(trigger))
@@ -1,15 +1,18 @@
+import asyncio
 import logging
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, List, Optional, Set
+from uuid import uuid4
 
-from dateutil.relativedelta import relativedelta
+from pydantic import ValidationError
 
-from src.bookmarks.extract import scrape_url
+from src.bookmarks.importers import iter_bookmark_urls
 from src.bookmarks.repos import bookmarks
-from src.bookmarks.schemas import Bookmark, BookmarkFilter, PaginationParams
-from src.bookmarks.use_cases.failed_bookmark import url_error
-from src.bookmarks.utils import read_json_file
+from src.bookmarks.schemas import Bookmark, BookmarkFilter, ImportProgress
+from src.bookmarks.scraper import ScrapeEngine, ScrapeResultBuffer
+from src.common.cache import get_cache
 from src.config import settings
 from src.db import database
 
@@ -17,50 +20,85 @@ logger = logging.getLogger(__name__)
 
 
 async def add_urls(urls: Iterable[str]) -> Iterable[Bookmark]:
-    created_bookmarks = []
     async with database.transaction():
-        for url in urls:
-            bm = await bookmarks.add(Bookmark(url=url))
-            created_bookmarks.append(bm)
+        added = await bookmarks.add_many(Bookmark(url=url) for url in urls)
+    # Reads during the transaction saw the old rows and may have cached them
+    await get_cache().invalidate(bookmarks.CACHE_TAG)
+    return added
 
-    return created_bookmarks
 
+async def import_urls_from_browser_bookmarks(
+    path: Path, on_progress: Optional[Callable[[ImportProgress], None]] = None
+) -> ImportProgress:
+    """Stream the urls of a browser export into the DB in batched upserts.
 
-async def import_urls_from_browser_bookmarks(path: Path):
-    contents = await read_json_file(path)
+    Urls are deduplicated by ``url_hash`` as they come; ``on_progress`` is
+    called after every batch.
+    """
+    progress = ImportProgress()
+    seen: Set[str] = set()
+    batch: List[Bookmark] = []
+    start = time.monotonic()
 
-    def get_urls(node):
-        if "children" in node:
-            for entry in node["children"]:
-                if "children" in entry:
-                    yield from get_urls(node["children"])
-                elif "uri" in entry:
-                    yield entry["uri"]
+    async def flush():
+        await bookmarks.add_many(batch)
+        progress.imported += len(batch)
+        progress.elapsed_seconds = time.monotonic() - start
+        batch.clear()
+        if on_progress:
+            on_progress(progress)
 
-    urls = get_urls(contents)
-    await add_urls(urls)
+    async for url in iter_bookmark_urls(path):
+        progress.found += 1
+        try:
+            bm = Bookmark(url=url)
+        except ValidationError:
+            progress.invalid += 1
+            continue
+
+        if bm.url_hash in seen:
+            progress.duplicated += 1
+            continue
+        seen.add(bm.url_hash)
+
+        batch.append(bm)
+        if len(batch) >= settings.bulk_chunk_size:
+            await flush()
+
+    await flush()
+    return progress
 
 
 async def update_urls():
-    filter_params = BookmarkFilter(
-        is_active=True,
-        pending_to_fetch=True,
-        last_fetched_before=datetime.now(timezone.utc)
-        - relativedelta(days=settings.refresh_urls_older_than_days),
-    )
+    now = datetime.now(timezone.utc)
+    filter_params = BookmarkFilter(is_active=True, due_before=now)
 
-    pagination = PaginationParams(
-        current_page=1, items_per_page=settings.batch_url_extractions
+    owner = uuid4().hex
+    entries = await bookmarks.claim(
+        owner=owner,
+        limit=settings.batch_url_extractions,
+        lease_seconds=settings.crawl_lease_seconds,
+        filter_params=filter_params,
     )
-    entries = await bookmarks.all(filter_params=filter_params, pagination=pagination)
 
-    for bookmark in entries:
-        logger.info(f"Scraping... {bookmark.url}")
-        bm = await scrape_url(bookmark.url)
-        if bm is None:
-            continue
+    buffer = ScrapeResultBuffer()
+    # A batch of slow or throttled hosts can outlast the lease
+    renewal = asyncio.create_task(keep_claimed(entries, owner))
+    try:
+        scraped = await ScrapeEngine().run(entries, buffer.add)
+        await buffer.flush()
+        logger.info(f"Scraped {scraped} urls")
+    finally:
+        renewal.cancel()
+        await bookmarks.release(entries, owner)
+
+
+async def keep_claimed(entries: List[Bookmark], owner: str):
+    """Renew the lease on ``entries`` every third of it, until cancelled"""
+    lease_seconds = settings.crawl_lease_seconds
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
         try:
-            await bookmarks.add(bm)
+            await bookmarks.renew(entries, owner, lease_seconds)
         except Exception as exc:
-            logger.error(f"Error when scrapping: {exc}")
-            await url_error(bookmark.url)
+            logger.error(f"Renewing the crawl lease failed: {exc}")
@@ -2,6 +2,7 @@ from uuid import UUID
 
 from src.bookmarks.exceptions import BookmarkNotFound
 from src.bookmarks.repos import bookmarks
+from src.common.cache import get_cache
 from src.db import database
 
 
@@ -14,4 +15,6 @@ async def delete_bookmark(id: UUID):
 
         await bookmarks.delete(bm)
 
-        return bm
+    # Reads during the transaction saw the old rows and may have cached them
+    await get_cache().invalidate(bookmarks.CACHE_TAG)
+    return bm
@@ -1,22 +1,38 @@
-from src.bookmarks.repos import bookmarks
-from src.bookmarks.schemas import BookmarkFilter, BookmarkStats
+from collections import Counter
+from typing import Dict, Iterable
 
+from src.bookmarks.repos import stats
+from src.bookmarks.repos.bookmarks import CACHE_TAG
+from src.bookmarks.schemas import BookmarkStats, Source
+from src.common.cache import get_cache
+from src.config import settings
 
-async def get_stats() -> BookmarkStats:
 
-    total = await bookmarks.count()
-    pending = await bookmarks.count(
-        BookmarkFilter(
-            pending_to_fetch=True,
-        )
-    )
-    inactive = await bookmarks.count(
-        BookmarkFilter(
-            is_active=False,
-        )
+async def get_stats() -> BookmarkStats:
+    buckets = await get_cache().get_or_load(
+        "stats", stats.all, settings.stats_cache_seconds, tags=[CACHE_TAG]
     )
+    return stats_from_buckets(buckets)
+
+
+def stats_from_buckets(buckets: Iterable[Dict]) -> BookmarkStats:
+    total = pending = inactive = 0
+    by_source: Counter = Counter()
+    by_read_state: Counter = Counter()
+    for bucket in buckets:
+        total += bucket["total"]
+        pending += bucket["pending"]
+        inactive += bucket["inactive"]
+        by_source[bucket["source"] or Source.UNDEFINED.value] += bucket["total"]
+        by_read_state["read" if bucket["is_read"] else "unread"] += bucket["total"]
+
     available = total - pending - inactive
 
     return BookmarkStats(
-        pending=pending, total=total, inactive=inactive, available=available
+        pending=pending,
+        total=total,
+        inactive=inactive,
+        available=available,
+        by_source=by_source,
+        by_read_state=by_read_state,
     )
@@ -1,26 +1,84 @@
-import json
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
 from itertools import chain, islice
-from pathlib import Path
+from typing import Dict, Optional, Tuple
 
-import aiofiles
-import httpx
 from httpx import HTTPError, Response
 from pydantic import AnyUrl
 
+from src.config import settings
+from src.http_client import get_client
 
-async def read_json_file(path: Path) -> dict:
-    async with aiofiles.open(path) as f:
-        contents = await f.read()
-        return json.loads(contents)
+HEAD_END = b"</head>"
 
 
-async def fetch_url(url: AnyUrl) -> Response:
-    async with httpx.AsyncClient() as client:
-        try:
-            resp = await client.get(url)
-            return resp
-        except HTTPError as exc:
-            raise ValueError(f"Error fetching {url}: {exc}")
+async def fetch_url(url: AnyUrl, headers: Optional[Dict[str, str]] = None) -> Response:
+    try:
+        resp = await get_client().get(url, headers=headers)
+        return resp
+    except HTTPError as exc:
+        raise ValueError(f"Error fetching {url}: {exc}")
+
+
+async def read_head(resp: Response, max_bytes: int) -> bytes:
+    buffer = bytearray()
+    async for chunk in resp.aiter_bytes():
+        # Only the new chunk (plus a tag-sized overlap) can hold a fresh </head>
+        start = max(len(buffer) - len(HEAD_END), 0)
+        buffer.extend(chunk)
+        if HEAD_END in buffer[start:].lower() or len(buffer) >= max_bytes:
+            break
+    return bytes(buffer[:max_bytes])
+
+
+async def fetch_page(
+    url: AnyUrl,
+    headers: Optional[Dict[str, str]] = None,
+    max_bytes: int = settings.fetch_max_bytes,
+) -> Tuple[Response, str]:
+    """Stream a page and keep only what is needed to extract its metadata.
+
+    The body is read up to ``</head>`` or ``max_bytes``, whichever comes first.
+    Non-OK responses and non-HTML content (e.g. images) are returned without
+    reading the body at all.
+    """
+    try:
+        async with get_client().stream("GET", url, headers=headers) as resp:
+            content_type = resp.headers.get("content-type") or ""
+            if resp.status_code != HTTPStatus.OK or "html" not in content_type:
+                return resp, ""
+
+            content = await read_head(resp, max_bytes)
+            return resp, content.decode(resp.encoding or "utf-8", errors="replace")
+    except HTTPError as exc:
+        raise ValueError(f"Error fetching {url}: {exc}")
+
+
+def conditional_headers(
+    etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> Dict[str, str]:
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait according to a ``Retry-After`` header (delay or HTTP date)"""
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
 
 
 def chunks(iterable, size=10):
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.auth.use_cases.session import prune_old_sessions
+from src.bookmarks.use_cases.add_bookmark import update_urls
+from src.common import leases
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_LEASE = "scheduler"
+
+
+class Job:
+    def __init__(
+        self,
+        name: str,
+        every_seconds: int,
+        func: Callable[[], Awaitable[None]],
+        wait_first: bool = False,
+        exclusive: bool = True,
+    ):
+        self.name = name
+        self.every_seconds = every_seconds
+        self.func = func
+        self.wait_first = wait_first
+        self.exclusive = exclusive
+        self.next_run_at: Optional[float] = None
+
+    def is_due(self, now: float) -> bool:
+        if self.next_run_at is None:
+            self.next_run_at = now + self.every_seconds if self.wait_first else now
+        return now >= self.next_run_at
+
+    async def run(self):
+        logger.info(f"Running job {self.name}")
+        try:
+            await self.func()
+        except Exception as exc:
+            logger.exception(f"Job {self.name} failed: {exc}")
+
+
+def default_jobs() -> List[Job]:
+    return [
+        # Bookmarks are claimed atomically, so every worker can scrape
+        Job(
+            "fetch_urls",
+            settings.run_refresh_url_task_every_seconds,
+            update_urls,
+            exclusive=False,
+        ),
+        Job(
+            "clean_sessions",
+            settings.run_refresh_url_task_every_seconds * 10,
+            prune_old_sessions,
+            wait_first=True,
+        ),
+    ]
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def run_scheduler(jobs: Optional[List[Job]] = None, owner: Optional[str] = None):
+    """Run the periodic jobs, exclusive ones only while holding the scheduler lease.
+
+    Every worker polls the lease; only its holder runs exclusive jobs, and it
+    renews the lease on each poll. A worker that loses the lease cancels its
+    running exclusive jobs, and another one takes over once the lease expires.
+    """
+    jobs = jobs or default_jobs()
+    owner = owner or worker_id()
+    running: Dict[str, asyncio.Task] = {}
+
+    try:
+        while True:
+            try:
+                await tick(jobs, owner, running)
+            except Exception as exc:
+                # e.g. the DB is briefly unreachable; try again on the next poll
+                logger.exception(f"Scheduler tick failed: {exc}")
+
+            await asyncio.sleep(settings.scheduler_poll_seconds)
+    finally:
+        for task in running.values():
+            task.cancel()
+        try:
+            await leases.release(SCHEDULER_LEASE, owner)
+        except Exception as exc:
+            logger.exception(f"Releasing the scheduler lease failed: {exc}")
+
+
+async def tick(jobs: List[Job], owner: str, running: Dict[str, asyncio.Task]):
+    """Renew (or try to take) the lease and start the jobs that are due"""
+    is_leader = await leases.acquire(
+        SCHEDULER_LEASE, owner, settings.scheduler_lease_seconds
+    )
+    now = time.monotonic()
+    for job in jobs:
+        task = running.get(job.name)
+        if job.exclusive and not is_leader:
+            if task is not None:
+                task.cancel()
+                del running[job.name]
+            job.next_run_at = None
+        elif (task is None or task.done()) and job.is_due(now):
+            running[job.name] = asyncio.create_task(job.run())
+            job.next_run_at = now + job.every_seconds
@@ -0,0 +1,435 @@
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from src.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+# Tag sets outlive the entries they point to; stale members are harmless
+TAG_TTL_SECONDS = 24 * 3600
+
+
+class TTLCache(Generic[V]):
+    """In-process LRU cache whose entries also expire after ``ttl`` seconds"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[V]:
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(ABC):
+    """Storage of serialized cache entries, grouped by tags for invalidation.
+
+    Every invalidation of a tag bumps its generation. A ``set`` given the
+    generations its value was read at is dropped if any of them moved since,
+    so a load that raced a write can't cache what the write replaced.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: float,
+        tags: Sequence[str] = (),
+        generations: Optional[Sequence[int]] = None,
+    ):
+        ...
+
+    @abstractmethod
+    async def delete(self, *keys: str):
+        ...
+
+    @abstractmethod
+    async def invalidate(self, *tags: str):
+        ...
+
+    @abstractmethod
+    async def generations(self, *tags: str) -> List[int]:
+        ...
+
+    async def close(self):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process LRU; every worker keeps (and invalidates) its own copy"""
+
+    def __init__(self, maxsize: int):
+        self._entries: TTLCache[bytes] = TTLCache(maxsize=maxsize)
+        self._tags: Dict[str, Set[str]] = {}
+        # Evicting a generation only makes in-flight loads skip caching
+        self._generations: TTLCache[int] = TTLCache(
+            maxsize=maxsize, ttl=TAG_TTL_SECONDS
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: float,
+        tags: Sequence[str] = (),
+        generations: Optional[Sequence[int]] = None,
+    ):
+        if generations is not None:
+            if await self.generations(*tags) != list(generations):
+                return
+        self._entries.set(key, value, ttl=ttl)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._entries.delete(key)
+
+    async def invalidate(self, *tags: str):
+        for tag in tags:
+            self._generations.set(tag, self._generations.get(tag, 0) + 1)
+            await self.delete(*self._tags.pop(tag, ()))
+
+    async def generations(self, *tags: str) -> List[int]:
+        return [self._generations.get(tag, 0) for tag in tags]
+
+
+# KEYS are the tag sets followed by their generations, ARGV the generations'
+# TTL: drops the entries of every set and the sets themselves and bumps the
+# generations, atomically. An expired generation reads as 0, which only makes
+# in-flight loads skip caching.
+INVALIDATE_SCRIPT = """
+local n = #KEYS / 2
+for t = 1, n do
+    local keys = redis.call('SMEMBERS', KEYS[t])
+    for i = 1, #keys, 1000 do
+        redis.call('DEL', unpack(keys, i, math.min(i + 999, #keys)))
+    end
+    redis.call('DEL', KEYS[t])
+    redis.call('INCR', KEYS[n + t])
+    redis.call('EXPIRE', KEYS[n + t], ARGV[1])
+end
+"""
+
+# KEYS are the entry, its tag sets and their generations; ARGV the value, its
+# TTL in ms, the tag sets' TTL and the generations the value was read at.
+# Nothing is written if any generation moved.
+SET_SCRIPT = """
+local n = (#KEYS - 1) / 2
+for t = 1, n do
+    if tonumber(redis.call('GET', KEYS[1 + n + t]) or 0) ~= tonumber(ARGV[3 + t]) then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+for t = 1, n do
+    redis.call('SADD', KEYS[1 + t], KEYS[1])
+    redis.call('EXPIRE', KEYS[1 + t], ARGV[3])
+end
+return 1
+"""
+
+
+class RedisBackend(CacheBackend):
+    """Cache shared by every worker and node pointing at the same Redis"""
+
+    def __init__(self, client):
+        self.client = client
+        self._invalidate = self.client.register_script(INVALIDATE_SCRIPT)
+        self._set = self.client.register_script(SET_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        # Optional dependency, only needed with CACHE_BACKEND=redis
+        import redis.asyncio as redis
+
+        return cls(redis.from_url(url))
+
+    @staticmethod
+    def tag_key(tag: str) -> str:
+        return f"tag:{tag}"
+
+    @staticmethod
+    def generation_key(tag: str) -> str:
+        return f"gen:{tag}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: float,
+        tags: Sequence[str] = (),
+        generations: Optional[Sequence[int]] = None,
+    ):
+        if generations is not None:
+            await self._set(
+                keys=[
+                    key,
+                    *(self.tag_key(tag) for tag in tags),
+                    *(self.generation_key(tag) for tag in tags),
+                ],
+                args=[value, int(ttl * 1000), TAG_TTL_SECONDS, *generations],
+            )
+            return
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(key, value, px=int(ttl * 1000))
+            for tag in tags:
+                pipe.sadd(self.tag_key(tag), key)
+                pipe.expire(self.tag_key(tag), TAG_TTL_SECONDS)
+            await pipe.execute()
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self.client.delete(*keys)
+
+    async def invalidate(self, *tags: str):
+        if tags:
+            await self._invalidate(
+                keys=[
+                    *(self.tag_key(tag) for tag in tags),
+                    *(self.generation_key(tag) for tag in tags),
+                ],
+                args=[TAG_TTL_SECONDS],
+            )
+
+    async def generations(self, *tags: str) -> List[int]:
+        if not tags:
+            return []
+        values = await self.client.mget(*(self.generation_key(tag) for tag in tags))
+        return [int(value or 0) for value in values]
+
+    async def close(self):
+        await self.client.close()
+
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, BaseModel):
+        return value.dict()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class Cache:
+    """JSON cache with TTLs, tag invalidation and single-flight loading.
+
+    Values must be JSON serializable (plain rows rather than models, so fields
+    like secrets or excluded ones survive the round trip); datetimes and UUIDs
+    come back as strings, ready to be parsed by the caller's models.
+
+    Writers invalidate their tags once the write is visible (i.e. after the
+    commit). A load that overlaps an invalidation still answers its callers,
+    but its value is not cached, so stale rows never outlive the load.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str = "bookmarker"):
+        self.backend = backend
+        self.namespace = namespace
+        self._loading: Dict[str, asyncio.Task] = {}
+
+    def key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    # A failing backend (e.g. Redis down) degrades to cache misses, it never
+    # fails the request
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        try:
+            value = await self.backend.get(self.key(key))
+        except Exception as exc:
+            logger.error(f"Cache get of {key} failed: {exc}")
+            return default
+        return default if value is None else json.loads(value)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        tags: Iterable[str] = (),
+        generations: Optional[Sequence[int]] = None,
+    ):
+        """Cache ``value``; with ``generations``, only if its tags didn't move"""
+        if ttl <= 0:
+            return
+        try:
+            await self.backend.set(
+                self.key(key),
+                json.dumps(value, default=json_default).encode(),
+                ttl,
+                [self.key(tag) for tag in tags],
+                generations,
+            )
+        except Exception as exc:
+            logger.error(f"Cache set of {key} failed: {exc}")
+
+    async def delete(self, *keys: str):
+        try:
+            await self.backend.delete(*(self.key(key) for key in keys))
+        except Exception as exc:
+            logger.error(f"Cache delete of {keys} failed: {exc}")
+
+    async def invalidate(self, *tags: str):
+        try:
+            await self.backend.invalidate(*(self.key(tag) for tag in tags))
+        except Exception as exc:
+            logger.error(f"Cache invalidation of {tags} failed: {exc}")
+
+    async def generations(self, *tags: str) -> Optional[List[int]]:
+        try:
+            return await self.backend.generations(*(self.key(tag) for tag in tags))
+        except Exception as exc:
+            logger.error(f"Cache generations of {tags} failed: {exc}")
+            return None
+
+    async def get_or_load(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[Any]],
+        ttl: float,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """Cached value of ``key``, loading and caching it on a miss.
+
+        Concurrent misses on the same key in this process share one ``load``
+        call, so an expired hot entry doesn't stampede the database. The load
+        runs in its own task: a cancelled caller stops waiting for it, but
+        neither the load nor the other callers are cancelled.
+        """
+        value = await self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, load, ttl, tags))
+            self._loading[key] = task
+            task.add_done_callback(lambda t: self._loaded(key, t))
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[Any]],
+        ttl: float,
+        tags: Iterable[str],
+    ) -> Any:
+        tags = list(tags)
+        # Read before loading, so a write landing during the load is noticed
+        generations = await self.generations(*tags)
+        value = await load()
+        if generations is not None:
+            await self.set(key, value, ttl, tags, generations)
+        return value
+
+    def _loaded(self, key: str, task: asyncio.Task):
+        if self._loading.get(key) is task:
+            del self._loading[key]
+        # Retrieve it, so a failed load whose callers all left doesn't warn
+        if not task.cancelled():
+            task.exception()
+
+
+_cache: Optional[Cache] = None
+
+
+def create_cache(settings: Settings = settings) -> Cache:
+    if settings.cache_backend == "redis":
+        backend: CacheBackend = RedisBackend.from_url(settings.redis_url)
+    else:
+        backend = MemoryBackend(maxsize=settings.cache_max_entries)
+    return Cache(backend)
+
+
+def get_cache() -> Cache:
+    global _cache
+    if _cache is None:
+        _cache = create_cache()
+    return _cache
+
+
+async def close_cache():
+    global _cache
+    if _cache is not None:
+        await _cache.backend.close()
+        _cache = None
+
+
+@asynccontextmanager
+async def cache_session():
+    get_cache()
+    try:
+        yield
+    finally:
+        await close_cache()
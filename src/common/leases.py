@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from src.common.tables import leases
+from src.db import database
+
+# Takes the lease when it is free or expired, renews it when already ours.
+# MySQL applies the assignments left to right, so the second IF sees the new owner.
+ACQUIRE_QUERY = """
+INSERT INTO leases (name, owner, expires_at) VALUES (:name, :owner, :expires_at)
+ON DUPLICATE KEY UPDATE
+    owner = IF(expires_at < :now OR owner = :owner, VALUES(owner), owner),
+    expires_at = IF(owner = :owner, VALUES(expires_at), expires_at)
+"""
+
+
+async def acquire(name: str, owner: str, ttl_seconds: int) -> bool:
+    """Take or renew the ``name`` lease for ``owner``; True when ``owner`` holds it"""
+    now = datetime.now(timezone.utc)
+    await database.execute(
+        query=ACQUIRE_QUERY,
+        values={
+            "name": name,
+            "owner": owner,
+            "now": now,
+            "expires_at": now + timedelta(seconds=ttl_seconds),
+        },
+    )
+    holder = await database.fetch_val(
+        select([leases.c.owner]).where(leases.c.name == name)
+    )
+    return holder == owner
+
+
+async def release(name: str, owner: str):
+    query = leases.delete().where(leases.c.name == name, leases.c.owner == owner)
+    _ = await database.execute(query)
@@ -0,0 +1,11 @@
+import sqlalchemy as sa
+
+from src.db import metadata
+
+leases = sa.Table(
+    "leases",
+    metadata,
+    sa.Column("name", sa.String(100), primary_key=True),
+    sa.Column("owner", sa.String(255), nullable=False),
+    sa.Column("expires_at", sa.DateTime, nullable=False),
+)
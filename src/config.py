@@ -28,6 +28,17 @@ class Settings(BaseSettings):
     remove_sessions_older_than_days: int = os.getenv(
         "REMOVE_SESSIONS_OLDER_THAN_DAYS", default=30
     )
+    session_prune_batch_size: int = os.getenv("SESSION_PRUNE_BATCH_SIZE", default=1000)
+    session_cache_seconds: int = os.getenv("SESSION_CACHE_SECONDS", default=60)
+    token_cache_size: int = os.getenv("TOKEN_CACHE_SIZE", default=10000)
+    token_cache_seconds: int = os.getenv("TOKEN_CACHE_SECONDS", default=300)
+
+    bulk_chunk_size: int = os.getenv("BULK_CHUNK_SIZE", default=500)
+    count_cache_seconds: int = os.getenv("COUNT_CACHE_SECONDS", default=30)
+    list_cache_seconds: int = os.getenv("LIST_CACHE_SECONDS", default=30)
+    stats_cache_seconds: int = os.getenv("STATS_CACHE_SECONDS", default=30)
+    cache_backend: str = os.getenv("CACHE_BACKEND", default="memory")
+    cache_max_entries: int = os.getenv("CACHE_MAX_ENTRIES", default=10000)
 
     max_failed_login_attempts: int = os.getenv("MAX_FAILED_LOGIN_ATTEMPTS", default=5)
     max_failed_url_extractions: int = os.getenv("MAX_FAILED_URL_EXTRACTIONS", default=5)
@@ -35,9 +46,58 @@ class Settings(BaseSettings):
     refresh_urls_older_than_days: int = os.getenv(
         "REFRESH_URLS_OLDER_THAN_DAYS", default=20
     )
+    refresh_urls_max_days: int = os.getenv("REFRESH_URLS_MAX_DAYS", default=180)
+    fetch_retry_base_seconds: int = os.getenv("FETCH_RETRY_BASE_SECONDS", default=3600)
+    fetch_retry_max_seconds: int = os.getenv(
+        "FETCH_RETRY_MAX_SECONDS", default=7 * 24 * 3600
+    )
+    fetch_schedule_jitter: float = os.getenv("FETCH_SCHEDULE_JITTER", default=0.1)
     run_refresh_url_task_every_seconds: int = os.getenv(
         "RUN_REFRESH_URL_TASK_EVERY_SECONDS", default=24 * 3600
     )
+    scrape_flush_size: int = os.getenv("SCRAPE_FLUSH_SIZE", default=50)
+    crawl_lease_seconds: int = os.getenv("CRAWL_LEASE_SECONDS", default=600)
+    scheduler_lease_seconds: int = os.getenv("SCHEDULER_LEASE_SECONDS", default=60)
+    scheduler_poll_seconds: int = os.getenv("SCHEDULER_POLL_SECONDS", default=15)
+    scrape_concurrency: int = os.getenv("SCRAPE_CONCURRENCY", default=10)
+    scrape_concurrency_per_host: int = os.getenv(
+        "SCRAPE_CONCURRENCY_PER_HOST", default=2
+    )
+    scrape_url_timeout_seconds: float = os.getenv(
+        "SCRAPE_URL_TIMEOUT_SECONDS", default=30
+    )
+    scrape_host_rate: float = os.getenv("SCRAPE_HOST_RATE", default=1)
+    scrape_host_burst: int = os.getenv("SCRAPE_HOST_BURST", default=2)
+    scrape_max_retries: int = os.getenv("SCRAPE_MAX_RETRIES", default=2)
+    scrape_max_retry_wait_seconds: float = os.getenv(
+        "SCRAPE_MAX_RETRY_WAIT_SECONDS", default=60
+    )
+
+    http_max_connections: int = os.getenv("HTTP_MAX_CONNECTIONS", default=100)
+    http_max_keepalive_connections: int = os.getenv(
+        "HTTP_MAX_KEEPALIVE_CONNECTIONS", default=20
+    )
+    http_keepalive_expiry_seconds: float = os.getenv(
+        "HTTP_KEEPALIVE_EXPIRY_SECONDS", default=30
+    )
+    http2: bool = os.getenv("HTTP2", default=True)
+    http_timeout_seconds: float = os.getenv("HTTP_TIMEOUT_SECONDS", default=15)
+    http_connect_timeout_seconds: float = os.getenv(
+        "HTTP_CONNECT_TIMEOUT_SECONDS", default=5
+    )
+    http_max_redirects: int = os.getenv("HTTP_MAX_REDIRECTS", default=5)
+    fetch_max_bytes: int = os.getenv("FETCH_MAX_BYTES", default=1024 * 1024)
+    html_parser_backend: str = os.getenv("HTML_PARSER_BACKEND", default="stream")
+    parser_executor: str = os.getenv("PARSER_EXECUTOR", default="process")
+    parser_workers: int = os.getenv("PARSER_WORKERS", default=2)
+    # argon2-cffi releases the GIL, so threads hash in parallel without pickling
+    password_executor: str = os.getenv("PASSWORD_EXECUTOR", default="thread")
+    password_workers: int = os.getenv("PASSWORD_WORKERS", default=2)
+    password_max_pending: int = os.getenv("PASSWORD_MAX_PENDING", default=16)
+    # Defaults are passlib 1.7.4's argon2 ones, so new hashes keep the same cost
+    argon2_time_cost: int = os.getenv("ARGON2_TIME_COST", default=3)
+    argon2_memory_cost: int = os.getenv("ARGON2_MEMORY_COST", default=65536)  # KiB
+    argon2_parallelism: int = os.getenv("ARGON2_PARALLELISM", default=4)
 
 
 settings = Settings()
@@ -0,0 +1,93 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+from src.config import settings
+
+T = TypeVar("T")
+
+PARSER = "parser"
+PASSWORD = "password"
+
+_executors: Dict[str, Optional[Executor]] = {}
+_limits: Dict[str, asyncio.Semaphore] = {}
+
+
+def executor_configs() -> Dict[str, Tuple[str, int, Optional[int]]]:
+    """Kind, workers and max pending calls (``None`` for no cap) per executor"""
+    return {
+        PARSER: (settings.parser_executor, settings.parser_workers, None),
+        PASSWORD: (
+            settings.password_executor,
+            settings.password_workers,
+            settings.password_max_pending,
+        ),
+    }
+
+
+def create_executor(name: str, kind: str, max_workers: int) -> Optional[Executor]:
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+    if kind == "inline":
+        return None
+    raise ValueError(f"Unknown executor kind for {name}: {kind}")
+
+
+def get_executor(name: str) -> Optional[Executor]:
+    if name not in _executors:
+        kind, max_workers, _ = executor_configs()[name]
+        _executors[name] = create_executor(name, kind, max_workers)
+    return _executors[name]
+
+
+def get_limit(name: str) -> Optional[asyncio.Semaphore]:
+    if name not in _limits:
+        max_pending = executor_configs()[name][2]
+        if max_pending is None:
+            return None
+        _limits[name] = asyncio.Semaphore(max_pending)
+    return _limits[name]
+
+
+async def run_in_executor(name: str, func: Callable[..., T], *args) -> T:
+    """Run ``func(*args)`` in the named executor, or inline when it has none.
+
+    Process pools pickle ``func``, its arguments and its result, so keep them
+    plain and small. Executors with a max pending cap make further callers
+    wait on the event loop, where they can still be cancelled, instead of
+    piling work up in the pool's queue.
+    """
+    limit = get_limit(name)
+    if limit is None:
+        return await _run(name, func, *args)
+    async with limit:
+        return await _run(name, func, *args)
+
+
+async def _run(name: str, func: Callable[..., T], *args) -> T:
+    executor = get_executor(name)
+    if executor is None:
+        return func(*args)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args))
+
+
+def shutdown_executors():
+    for executor in _executors.values():
+        if executor is not None:
+            executor.shutdown(wait=True)
+    _executors.clear()
+    _limits.clear()
+
+
+@asynccontextmanager
+async def executors_session():
+    try:
+        yield
+    finally:
+        shutdown_executors()
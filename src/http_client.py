@@ -0,0 +1,52 @@
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import httpx
+
+from src.config import Settings, settings
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def create_client(settings: Settings = settings) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=settings.http2,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+        timeout=httpx.Timeout(
+            settings.http_timeout_seconds,
+            connect=settings.http_connect_timeout_seconds,
+        ),
+        follow_redirects=True,
+        max_redirects=settings.http_max_redirects,
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_client()
+    return _client
+
+
+async def open_client():
+    get_client()
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@asynccontextmanager
+async def client_session():
+    await open_client()
+    try:
+        yield
+    finally:
+        await close_client()
@@ -3,18 +3,17 @@ from http import HTTPStatus
 
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi_utils.tasks import repeat_every
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.cors import CORSMiddleware
 from starlette.responses import FileResponse, JSONResponse, RedirectResponse
 
 from src.auth.routes import router as auth_router
-from src.auth.use_cases.session import prune_old_sessions
 from src.bookmarks.routes import router as bookmark_router
-from src.bookmarks.use_cases.add_bookmark import update_urls
+from src.common.cache import close_cache
 from src.common.exceptions import BaseError
 from src.config import settings
 from src.db import database
+from src.executors import shutdown_executors
 
 logger = logging.getLogger(__name__)
 
@@ -61,27 +60,11 @@ async def connect_services():
     await database.connect()
 
 
-@app.on_event("startup")
-@repeat_every(
-    seconds=settings.run_refresh_url_task_every_seconds * 10,
-    wait_first=True,
-    raise_exceptions=True,
-)
-async def clean_sessions():
-    await prune_old_sessions()
-
-
-@app.on_event("startup")
-@repeat_every(
-    seconds=settings.run_refresh_url_task_every_seconds, raise_exceptions=True
-)
-async def fetch_urls():
-    await update_urls()
-
-
 @app.on_event("shutdown")
 async def disconnect_services():
     await database.disconnect()
+    await close_cache()
+    shutdown_executors()
 
 
 @app.get("/health")
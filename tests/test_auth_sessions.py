@@ -0,0 +1,60 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from src.auth.repos import sessions
+from src.common.cache import Cache, MemoryBackend
+
+
+def session_row(token: str):
+    return {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "token": token,
+        "created_at": datetime.now(timezone.utc).replace(tzinfo=None),
+        "is_active": True,
+        "email": "user@example.com",
+        "last_login_at": None,
+        "user_is_active": True,
+        "failed_attempts": 0,
+    }
+
+
+def test_logout_during_a_read_is_not_cached_back(monkeypatch):
+    cache = Cache(MemoryBackend(maxsize=100))
+    row = session_row("token")
+
+    async def fetch_one(query):
+        # The session is read, then deleted before the read caches it
+        await sessions.delete([sessions.result_mapper(row)])
+        return row
+
+    async def execute(query):
+        pass
+
+    monkeypatch.setattr(sessions, "get_cache", lambda: cache)
+    monkeypatch.setattr(sessions.database, "fetch_one", fetch_one)
+    monkeypatch.setattr(sessions.database, "execute", execute)
+
+    async def run():
+        await sessions.get(token="token")
+        return await cache.get(sessions.cache_key("token"))
+
+    assert asyncio.run(run()) is None
+
+
+def test_read_session_is_cached(monkeypatch):
+    cache = Cache(MemoryBackend(maxsize=100))
+    row = session_row("token")
+
+    async def fetch_one(query):
+        return row
+
+    monkeypatch.setattr(sessions, "get_cache", lambda: cache)
+    monkeypatch.setattr(sessions.database, "fetch_one", fetch_one)
+
+    async def run():
+        await sessions.get(token="token")
+        return await cache.get(sessions.cache_key("token"))
+
+    assert asyncio.run(run())["token"] == "token"
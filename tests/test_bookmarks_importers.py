@@ -0,0 +1,33 @@
+import asyncio
+import codecs
+
+import pytest
+
+from src.bookmarks.importers import iter_bookmark_urls
+
+FIREFOX_JSON = b"""{"children": [
+    {"uri": "https://example.com/a"},
+    {"children": [{"uri": "place:sort=8"}, {"uri": "http://example.com/b"}]}
+]}"""
+
+NETSCAPE_HTML = b"""<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<DL><p>
+    <DT><A HREF="https://example.com/a">A</A>
+    <DT><A HREF="javascript:void(0)">B</A>
+    <DT><A HREF="http://example.com/b">C</A>
+</DL><p>"""
+
+
+async def collect(path):
+    return [url async for url in iter_bookmark_urls(path)]
+
+
+@pytest.mark.parametrize("content", [FIREFOX_JSON, NETSCAPE_HTML], ids=["json", "html"])
+@pytest.mark.parametrize("bom", [b"", codecs.BOM_UTF8], ids=["plain", "bom"])
+def test_exports_yield_their_http_urls(tmp_path, content, bom):
+    path = tmp_path / "bookmarks"
+    path.write_bytes(bom + content)
+
+    urls = asyncio.run(collect(path))
+
+    assert urls == ["https://example.com/a", "http://example.com/b"]
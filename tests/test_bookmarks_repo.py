@@ -0,0 +1,67 @@
+import asyncio
+from datetime import datetime
+
+from databases.backends.mysql import MySQLBackend
+
+from src.bookmarks.repos import bookmarks
+from src.bookmarks.schemas import Bookmark
+from src.config import settings
+
+
+def compile_query(query):
+    """SQL and parameters as ``databases`` sends them, Python defaults unrun"""
+    sql, args, _ = MySQLBackend(settings.database_url).connection()._compile(query)
+    return sql, args
+
+
+def test_insert_writes_random_key():
+    bm = Bookmark(url="https://example.com")
+
+    sql, args = compile_query(bookmarks.upsert_query([bookmarks.bookmark_row(bm)]))
+
+    assert 0 <= bm.random_key < 1
+    assert args["random_key_m0"] == bm.random_key
+    assert "random_key=" not in sql.split("ON DUPLICATE KEY UPDATE")[1]
+
+
+def test_scraped_upsert_keeps_is_read():
+    bm = Bookmark(url="https://example.com", title="Example")
+    row = bookmarks.bookmark_row(bm, bookmarks.SCRAPED_COLUMNS)
+
+    sql, args = compile_query(bookmarks.upsert_query([row]))
+
+    assert "is_read" not in sql
+    assert args["random_key_m0"] == bm.random_key
+    assert "title=VALUES(title)" in sql
+
+
+def added_queries(monkeypatch, bookmarks_, **kwargs):
+    """Compiled statements ``add_many`` runs for ``bookmarks_``"""
+    queries = []
+
+    async def execute(query):
+        queries.append(compile_query(query))
+
+    monkeypatch.setattr(bookmarks.database, "execute", execute)
+    asyncio.run(bookmarks.add_many(bookmarks_, **kwargs))
+    return queries
+
+
+def test_added_bookmarks_are_due_and_keep_their_schedule(monkeypatch):
+    new = [Bookmark(url=f"https://example.com/{i}") for i in range(3)]
+
+    [(sql, args)] = added_queries(monkeypatch, new)
+
+    assert None not in args.values()
+    assert all(args[f"next_fetch_at_m{i}"] for i in range(3))
+    assert "next_fetch_at=COALESCE(next_fetch_at, VALUES(next_fetch_at))" in sql
+
+
+def test_scraped_bookmarks_overwrite_their_schedule(monkeypatch):
+    scraped = Bookmark(url="https://example.com", next_fetch_at=datetime(2030, 1, 1))
+
+    [(sql, _)] = added_queries(
+        monkeypatch, [scraped], columns=bookmarks.SCRAPED_COLUMNS
+    )
+
+    assert "next_fetch_at=VALUES(next_fetch_at)" in sql
@@ -0,0 +1,18 @@
+from src.bookmarks.schemas import Bookmark
+
+
+def test_crawler_bookkeeping_is_not_served():
+    bm = Bookmark(url="https://example.com", etag='"abc"', content_hash="0" * 40)
+
+    served = bm.dict()
+
+    for field in (
+        "etag",
+        "last_modified",
+        "random_key",
+        "content_hash",
+        "unchanged_fetches",
+        "next_fetch_at",
+    ):
+        assert field not in served
+    assert bm.etag == '"abc"'
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from src.common.cache import Cache, CacheBackend, MemoryBackend, RedisBackend
+
+
+def memory_backend() -> CacheBackend:
+    return MemoryBackend(maxsize=100)
+
+
+def redis_backend() -> CacheBackend:
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis runs the Lua scripts with it
+    return RedisBackend(fakeredis.FakeAsyncRedis())
+
+
+@pytest.fixture(params=[memory_backend, redis_backend], ids=["memory", "redis"])
+def cache(request) -> Cache:
+    return Cache(request.param())
+
+
+class FailingBackend(MemoryBackend):
+    async def get(self, key):
+        raise ConnectionError("down")
+
+    async def set(self, *args, **kwargs):
+        raise ConnectionError("down")
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_invalidate_drops_tagged_entries(cache):
+    async def run():
+        await cache.set("a", {"n": 1}, ttl=60, tags=["t"])
+        await cache.set("b", [2], ttl=60)
+        await cache.invalidate("t")
+        return await cache.get("a"), await cache.get("b")
+
+    assert asyncio.run(run()) == (None, [2])
+
+
+def test_set_after_invalidation_is_dropped(cache):
+    async def run():
+        generations = await cache.generations("t")
+        await cache.invalidate("t")
+        await cache.set("a", 1, ttl=60, tags=["t"], generations=generations)
+        return await cache.get("a")
+
+    assert asyncio.run(run()) is None
+
+
+def test_load_racing_a_write_is_not_cached(cache):
+    async def run():
+        async def load():
+            await cache.invalidate("t")  # a write lands mid-load
+            return "old"
+
+        loaded = await cache.get_or_load("a", load, ttl=60, tags=["t"])
+        return loaded, await cache.get("a")
+
+    assert asyncio.run(run()) == ("old", None)
+
+
+def test_concurrent_misses_share_one_load(cache):
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def run():
+        loaded = await asyncio.gather(
+            *(cache.get_or_load("a", load, ttl=60, tags=["t"]) for _ in range(5))
+        )
+        return loaded, await cache.get("a")
+
+    assert asyncio.run(run()) == ([1] * 5, 1)
+    assert calls == 1
+
+
+def test_cancelled_caller_leaves_the_load_running(cache):
+    async def load():
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        first = asyncio.create_task(cache.get_or_load("a", load, ttl=60))
+        second = asyncio.create_task(cache.get_or_load("a", load, ttl=60))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(run()) == ("value", True)
+
+
+def test_failing_backend_falls_back_to_the_loader():
+    cache = Cache(FailingBackend(maxsize=100))
+
+    async def load():
+        return "value"
+
+    assert asyncio.run(cache.get_or_load("a", load, ttl=60)) == "value"